@@ -1,30 +1,63 @@
 import argparse
-import random
+import copy
+import itertools
 import string
 import textwrap
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 import os
+import functools
+import threading
+import zlib
+import math
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 
 from mimesis import Person
 from mimesis import Locale
-from mimesis import Gender
 from mimesis import Address
-from mimesis import Transport
 from mimesis import Text
 from mimesis.builtins import RussiaSpecProvider
+from mimesis.random import Random as MimesisRandom
+from mimesis.data import AIRPLANES, AUTO_MANUFACTURERS, CARS
 
-def transpose(matrix: list) -> list:
-    """Транспонирование матрицы"""
-    return [[matrix[a][b] for a in range(len(matrix))] for b in range(len(matrix[0]))]
+# размер шарда, если таблица генерируется не потоково
+DEFAULT_SHARD_SIZE = 100_000
 
+# веса контрольных цифр ИНН физического лица, ОГРН и СНИЛС
+INN_WEIGHTS_N2 = np.array([7, 2, 4, 10, 3, 5, 9, 4, 6, 8])
+INN_WEIGHTS_N1 = np.array([3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8])
+OGRN_WEIGHTS = np.array([pow(10, 11 - i, 11) for i in range(12)])  # остатки 10^k по модулю 11
+SNILS_WEIGHTS = np.arange(9, 0, -1)
 
-def set_genders(num: int) -> list:
+# больше значений уникальный номер строки не перемешивает, остальное - случайный сдвиг (см. get_unique_index)
+UNIQUE_BLOCK_SIZE = 2 ** 40
+
+# коды налоговых органов для КПП (как в mimesis)
+KPP_TAX_CODES = np.frombuffer('''
+    7700 7800 5000 0100 0200 0300 0500 0600 0700 0800 0900 1000 1100 1200 1300 1400 1500 1600 1700
+    1800 1900 2000 2100 2200 2300 2400 2500 2600 2700 2800 2900 3000 3100 3200 3300 3400 3500 3600
+    3700 3800 3900 4000 4100 4900 5100 5200 5300 5400 5500 5600 5700 5800 5900 6000 6100 6200 6300
+    6400 6500 6600 6700 6800 6900 7000 7100 7200 7300 7400 7500 7600 7900 8600 8700 8900 9100 9200
+    9800 9900 9901 9951 9952 9953 9954 9955 9956 9957 9958 9959 9961 9962 9965 9966 9971 9972 9973
+    9974 9975 9976 9977 9979 9998
+'''.replace(' ', '').replace('\n', '').encode(), dtype=np.uint8).reshape(-1, 4)
+
+# буквы автомобильных номеров, у которых есть латинские двойники
+CAR_PLATE_LETTERS = {'ru': 'АВЕКМНОРСТУХ', 'en': 'ABEKMHOPCTYX'}
+
+
+def get_provider_seed(rng: np.random.Generator) -> int:
+    """Получаем seed для провайдера mimesis из генератора столбца"""
+    return int(rng.integers(2 ** 63))
+
+
+def set_genders(num: int, rng: np.random.Generator) -> list:
     """Устанавливаем пол"""
-    gender_column = []
-    for _ in range(num): gender_column.append(random.choice(['F', 'M']))
-    return gender_column
+    return rng.choice(['F', 'M'], size=num).tolist()
 
 
 def get_locale_from_str(lng: str) -> Locale:
@@ -77,414 +110,604 @@ def get_locale_from_str(lng: str) -> Locale:
         case _: return Locale.EN            #Default English
 
 
-def get_gender_column(attribute: str, gender_column: list, lng: str) -> list:
-    """Получаем столбик с полом"""
-    parsed_attributes = attribute.split('_')
-    data_column = []
-    if len(parsed_attributes) == 1:
-        if lng.lower() == 'ru':
-            for gender in gender_column:
-                if gender == 'F': data_column.append('Ж')
-                else:             data_column.append('М')
-        else:
-            for gender in gender_column:
-                if gender == 'F': data_column.append('F')
-                else:             data_column.append('M')
-    else:
-        if lng.lower() == 'ru':
-            for gender in gender_column:
-                if gender == 'F': data_column.append('Женщина')
-                else:             data_column.append('Мужчина')
-        else:
-            for gender in gender_column:
-                if gender == 'F': data_column.append('Female')
-                else:             data_column.append('Male')
-    return data_column
+@dataclass(frozen=True)
+class ColumnSpec:
+    """Разобранный и проверенный тип столбца (план генерации столбца).
 
+    attribute - исходная строка типа, kind - вид столбца (name, int, phone...),
+    variant - вариант вида (brand/number/manufacturer у car, домен у email, full у name/address/gender...),
+    parts - части значения (у name и address, у address номер дома - ('num', n1, n2);
+    у phone - коды страны и региона, None - случайный код),
+    low/high - границы значений (int, float, длина string, даты), probability - вероятность True у boolean,
+    unique - значения столбца не повторяются (суффикс _unique у типа).
+    """
+    attribute: str
+    kind: str
+    variant: str = None
+    parts: tuple = ()
+    low: object = None
+    high: object = None
+    probability: float = None
+    unique: bool = False
 
-def get_names_column(attribute: str, gender_column: list, lng: str) -> list:
-    """Получаем список имён согласно значению аттрибута"""
-    parsed_attributes = attribute.split('_')
-    data_column = []
-    locale = get_locale_from_str(lng)
-    person = Person(locale=locale)
-    ru = RussiaSpecProvider()
 
-    # полное имя
-    if len(parsed_attributes) == 1 or attribute == 'name_full':
-        if lng == 'ru':
-            for gender in gender_column:
-                if gender == 'F':
-                    name = person.first_name(gender=Gender.FEMALE).strip() + ' ' +\
-                           ru.patronymic(gender=Gender.FEMALE).strip() + ' ' +\
-                           person.last_name(gender=Gender.FEMALE).strip()
-                else:
-                    name = person.first_name(gender=Gender.MALE).strip() + ' ' +\
-                           ru.patronymic(gender=Gender.MALE).strip() + ' ' +\
-                           person.last_name(gender=Gender.MALE).strip()
-                data_column.append(name)
-        else:
-            for gender in gender_column:
-                if gender == 'F':
-                    name = person.full_name(gender=Gender.FEMALE).strip()
-                else:
-                    name = person.full_name(gender=Gender.MALE).strip()
-                data_column.append(name)
-    # имя имеет другой формат
-    else:
-        if lng == 'ru':
-            for gender in gender_column:
-                name = ''
-                if gender == 'F':
-                    for name_part in parsed_attributes:
-                        match name_part:
-                            case 'name':
-                                pass
-                            case 'first':
-                                name = name + person.first_name(gender=Gender.FEMALE).strip() + ' '
-                            case 'last':
-                                name = name + person.last_name(gender=Gender.FEMALE).strip() + ' '
-                            case 'patronymic':
-                                name = name + ru.patronymic(gender=Gender.FEMALE).strip() + ' '
-                            case _:
-                                pass
-                else:
-                    for name_part in parsed_attributes:
-                        match name_part:
-                            case 'name':
-                                pass
-                            case 'first':
-                                name = name + person.first_name(gender=Gender.MALE).strip() + ' '
-                            case 'last':
-                                name = name + person.last_name(gender=Gender.MALE).strip() + ' '
-                            case 'patronymic':
-                                name = name + ru.patronymic(gender=Gender.MALE).strip() + ' '
-                            case _:
-                                pass
-                data_column.append(name.strip())
-        else:
-            for gender in gender_column:
-                name = ''
-                if gender == 'F':
-                    for name_part in parsed_attributes:
-                        match name_part:
-                            case 'name':
-                                pass
-                            case 'first':
-                                name = name + person.first_name(gender=Gender.FEMALE).strip() + ' '
-                            case 'last':
-                                name = name + person.last_name(gender=Gender.FEMALE).strip() + ' '
-                            case 'patronymic':
-                                name = name + person.first_name(gender=Gender.MALE).strip() + ' '
-                            case _:
-                                pass
-                else:
-                    for name_part in parsed_attributes:
-                        match name_part:
-                            case 'name':
-                                pass
-                            case 'first':
-                                name = name + person.first_name(gender=Gender.MALE).strip() + ' '
-                            case 'last':
-                                name = name + person.last_name(gender=Gender.MALE).strip() + ' '
-                            case 'patronymic':
-                                name = name + person.first_name(gender=Gender.MALE).strip() + ' '
-                            case _:
-                                pass
-                data_column.append(name.strip())
+def check_attribute_parts(attribute: str, parsed_attributes: list, count: int):
+    """Проверяем, что у типа указаны все параметры, а не только часть"""
+    if len(parsed_attributes) != 1 and len(parsed_attributes) < count + 1:
+        raise ValueError(f'У типа {attribute} должно быть {count} параметра через _ или ни одного')
 
-    return data_column
 
+def compile_column_spec(attribute) -> ColumnSpec:
+    """Разбираем строку типа столбца один раз до генерации"""
+    if isinstance(attribute, ColumnSpec):
+        return attribute
+
+    if attribute.endswith('_unique'):
+        spec = replace(compile_column_spec(attribute.removesuffix('_unique')), attribute=attribute, unique=True)
+        get_value_domain(spec)  # проверяем, что тип поддерживает unique
+        return spec
 
-def get_address_columns(attribute: str, num: int, lng: str) -> list:
-    """Получаем адреса мест согласно значению аттрибута"""
     parsed_attributes = attribute.split('_')
-    data_column = []
-    locale = get_locale_from_str(lng)
-    address = Address(locale=locale)
-
-    # полное название
-    # address_country_city_street_num_1_10
-    if len(parsed_attributes) == 1 or attribute == 'address_full':
-        for _ in range(num):
-            place = address.country().strip() + ', ' +\
-                    address.city().strip() + ', ' +\
-                    address.street_name().strip() + ', ' +\
-                    str(random.randint(1, 10))
-            data_column.append(place)
-    else:
-        for _ in range(num):
-            place = ''
-            j = 0
-            for place_part in parsed_attributes:
+    kind = parsed_attributes[0]
+    match kind:
+        case 'name':
+            if len(parsed_attributes) == 1 or attribute == 'name_full':
+                return ColumnSpec(attribute, kind, variant='full')
+            parts = tuple(part for part in parsed_attributes[1:] if part in ('first', 'last', 'patronymic'))
+            return ColumnSpec(attribute, kind, parts=parts)
+        case 'address':
+            if len(parsed_attributes) == 1 or attribute == 'address_full':
+                parsed_attributes = ['address', 'country', 'city', 'street', 'num', '1', '10']
+            parts = []
+            for j, place_part in enumerate(parsed_attributes):
                 match place_part:
-                    case 'place':
-                        pass
-                    case 'continent':
-                        place = place + address.continent().strip() + ', '
-                    case 'country':
-                        place = place + address.country().strip() + ', '
-                    case 'city':
-                        place = place + address.city().strip() + ', '
-                    case 'street':
-                        place = place + address.street_name().strip() + ', '
+                    case 'continent' | 'country' | 'city' | 'street':
+                        parts.append(place_part)
                     case 'num':
-                        place = place + str(
-                            random.randint(int(parsed_attributes[j + 1]), int(parsed_attributes[j + 2]))) + ', '
+                        if len(parsed_attributes) < j + 3:
+                            raise ValueError("После num у адреса должны идти границы номера n1 и n2")
+                        n1, n2 = int(parsed_attributes[j + 1]), int(parsed_attributes[j + 2])
+                        if n1 > n2:
+                            raise ValueError("Начало диапазона номеров адреса больше конца")
+                        parts.append(('num', n1, n2))
                     case _:
                         pass
-                j = j + 1
-            data_column.append(place.strip().rstrip(','))
-
-    return data_column
-
-
-def get_email_column(attribute: str, num: int, lng: str) -> list:
-    """Получаем электронные почты согласно значению атрибута"""
-    parsed_attributes = attribute.split('_')
-    data_column = []
-    locale = get_locale_from_str(lng)
-    person = Person(locale=locale)
-
-    for _ in range(num):
-        if len(parsed_attributes) > 1:
-            domain = parsed_attributes[1].lstrip('@')
-            data_column.append(person.email(domains=[domain]))
-        else:
-            data_column.append(person.email())
-
+            return ColumnSpec(attribute, kind, parts=tuple(parts))
+        case 'email':
+            domain = parsed_attributes[1].lstrip('@') if len(parsed_attributes) > 1 else None
+            return ColumnSpec(attribute, kind, variant=domain)
+        case 'date':
+            check_attribute_parts(attribute, parsed_attributes, 2)
+            if len(parsed_attributes) == 1:
+                start_date_str, end_date_str = '01.01.2000', '12.12.2010'
+            else:
+                start_date_str, end_date_str = parsed_attributes[1], parsed_attributes[2]
+            start_date = datetime.strptime(start_date_str, '%d.%m.%Y')
+            end_date = datetime.strptime(end_date_str, '%d.%m.%Y')
+            if start_date > end_date:
+                raise ValueError("Начальная дата больше конечной даты.")
+            return ColumnSpec(attribute, kind, low=start_date, high=end_date)
+        case 'phone':
+            check_attribute_parts(attribute, parsed_attributes, 2)
+            if len(parsed_attributes) == 1:
+                return ColumnSpec(attribute, kind, parts=(None, None))
+            country_code, region_code = parsed_attributes[1], parsed_attributes[2]
+            return ColumnSpec(attribute, kind, parts=(None if country_code == 'r' else country_code,
+                                                      None if region_code == 'r' else region_code))
+        case 'gender':
+            return ColumnSpec(attribute, kind, variant='short' if len(parsed_attributes) == 1 else 'full')
+        case 'int':
+            check_attribute_parts(attribute, parsed_attributes, 2)
+            if len(parsed_attributes) == 1:
+                return ColumnSpec(attribute, kind, low=0, high=100)
+            n1, n2 = int(parsed_attributes[1]), int(parsed_attributes[2])
+            if n1 > n2:
+                raise ValueError(f'У типа {attribute} начало диапазона n1 больше конца n2')
+            return ColumnSpec(attribute, kind, low=n1, high=n2)
+        case 'float':
+            check_attribute_parts(attribute, parsed_attributes, 2)
+            if len(parsed_attributes) == 1:
+                return ColumnSpec(attribute, kind, low=0.0, high=1.0)
+            n1, n2 = float(parsed_attributes[1]), float(parsed_attributes[2])
+            if n1 > n2:
+                raise ValueError(f'У типа {attribute} начало диапазона n1 больше конца n2')
+            return ColumnSpec(attribute, kind, low=n1, high=n2)
+        case 'boolean':
+            if len(parsed_attributes) == 1:
+                return ColumnSpec(attribute, kind, probability=0.5)
+            pr = int(parsed_attributes[1])
+            if not 0 <= pr <= 100:
+                raise ValueError("Вероятность должна быть в диапазоне от 0 до 100")
+            return ColumnSpec(attribute, kind, probability=pr / 100)
+        case 'string':
+            check_attribute_parts(attribute, parsed_attributes, 2)
+            if len(parsed_attributes) == 1:
+                n1, n2 = 10, 20
+            else:
+                n1, n2 = int(parsed_attributes[1]), int(parsed_attributes[2])
+            if n1 < 1 or n2 < n1:
+                raise ValueError("n1 должен быть больше или равен 1, а n2 должен быть больше n1")
+            return ColumnSpec(attribute, kind, low=n1, high=n2)
+        case 'car':
+            variant = parsed_attributes[1] if len(parsed_attributes) > 1 else 'brand'
+            if variant not in ('brand', 'number', 'manufacturer'):
+                variant = 'brand'
+            return ColumnSpec(attribute, kind, variant=variant)
+        case 'passport':
+            variant = parsed_attributes[1] if len(parsed_attributes) > 1 else 'full'
+            if variant not in ('number', 'series'):
+                variant = 'full'
+            return ColumnSpec(attribute, kind, variant=variant)
+        case 'airplane' | 'education' | 'occupation' | 'color' | 'bic' | 'inn' | 'kpp' | 'ogrn' | 'snils' | 'postal':
+            return ColumnSpec(attribute, kind)
+        case _: raise TypeError(f'Нет типа {kind} у аттрибутов')
+
+
+def get_value_domain(spec: ColumnSpec):
+    """Кол-во различных значений столбца (домен для unique), None - не ограничено"""
+    match spec.kind, spec.variant:
+        case 'inn', _: return 9 * 10 ** 9
+        case 'ogrn', _: return 9 * 10 ** 11
+        case 'snils', _: return 10 ** 9
+        case 'bic', _: return 10 * 100 * 950
+        case 'kpp', _: return len(KPP_TAX_CODES) * 99 * 999
+        case 'passport', 'number': return 900_000
+        case 'passport', 'series': return 99 * get_passport_years()
+        case 'passport', _: return 99 * get_passport_years() * 900_000
+        case 'int', _: return spec.high - spec.low + 1
+        case 'car', 'number': return len(CAR_PLATE_LETTERS['ru']) ** 3 * 999 * 99
+        case 'email', _: return None
+        case _: raise TypeError(f'Тип {spec.kind} не поддерживает unique')
+
+
+def check_unique_domains(attributes: list, num: int):
+    """Проверяем до генерации, что уникальным столбцам хватает различных значений"""
+    for attribute in attributes:
+        spec = compile_column_spec(attribute)
+        if not spec.unique:
+            continue
+        domain = get_value_domain(spec)
+        if domain is not None and num > domain:
+            raise ValueError(f'У столбца {spec.attribute} всего {domain} различных значений, '
+                             f'а нужно {num} уникальных')
+
+
+class ProviderRegistry:
+    """Кэш провайдеров mimesis по (классу провайдера, языку) с вытеснением давно не используемых.
+
+    Провайдер при создании читает и разбирает json с данными языка, поэтому в процессе
+    каждый шаблон провайдера создаётся один раз. Наружу отдаётся только его поверхностная копия
+    со своим генератором случайных чисел: разобранные данные общие, а состояние у каждого вызова своё.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._providers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_template(self, provider_class, locale: Locale = None):
+        """Возвращаем шаблон провайдера из кэша или создаём новый"""
+        key = (provider_class, locale)
+        with self._lock:
+            template = self._providers.get(key)
+            if template is not None:
+                self.hits += 1
+                self._providers.move_to_end(key)
+                return template
+
+            self.misses += 1
+            template = provider_class() if locale is None else provider_class(locale=locale)
+            self._providers[key] = template
+            if len(self._providers) > self.maxsize:
+                self._providers.popitem(last=False)
+            return template
+
+    def get(self, provider_class, locale: Locale = None, seed: int = None):
+        """Возвращаем собственный провайдер вызывающего: копию шаблона с новым генератором"""
+        provider = copy.copy(self.get_template(provider_class, locale))
+        provider.random = MimesisRandom()
+        provider.reseed(seed)
+        return provider
+
+    def cache_info(self) -> dict:
+        """Статистика попаданий в кэш"""
+        return {'hits': self.hits, 'misses': self.misses, 'maxsize': self.maxsize, 'size': len(self._providers)}
+
+    def clear(self):
+        """Очищаем кэш и счётчики"""
+        with self._lock:
+            self._providers.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+PROVIDER_REGISTRY = ProviderRegistry()
+
+
+def get_provider(provider_class, lng: str = None, rng: np.random.Generator = None):
+    """Получаем провайдер на основе общего кэша, при переданном генераторе - с seed из него"""
+    locale = None if lng is None else get_locale_from_str(lng)
+    seed = None if rng is None else get_provider_seed(rng)
+    return PROVIDER_REGISTRY.get(provider_class, locale, seed)
+
+
+def get_gender_column(spec: ColumnSpec, gender_column: list, lng: str) -> pd.Categorical:
+    """Получаем столбик с полом"""
+    if spec.variant == 'short':
+        categories = ['Ж', 'М'] if lng.lower() == 'ru' else ['F', 'M']
+    else:
+        categories = ['Женщина', 'Мужчина'] if lng.lower() == 'ru' else ['Female', 'Male']
+    codes = (np.asarray(gender_column) == 'M').astype(np.int8)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+@functools.lru_cache(maxsize=None)
+def get_vocabulary_pool(kind: str, lng: str) -> np.ndarray:
+    """Загружаем словарь значений из данных mimesis один раз на процесс"""
+    match kind:
+        case 'first_name_female': values = get_provider(Person, lng).extract(['names', 'female'])
+        case 'first_name_male': values = get_provider(Person, lng).extract(['names', 'male'])
+        case 'last_name_female' | 'last_name_male':
+            values = get_provider(Person, lng).extract(['surnames'])
+            # фамилии разделены по полу не во всех языках
+            if isinstance(values, dict):
+                values = values[kind.split('_')[-1]]
+        case 'patronymic_female': values = get_provider(RussiaSpecProvider).extract(['patronymic', 'female'])
+        case 'patronymic_male': values = get_provider(RussiaSpecProvider).extract(['patronymic', 'male'])
+        case 'continent': values = get_provider(Address, lng).extract(['continent'])
+        case 'country': values = get_provider(Address, lng).extract(['country', 'name'])
+        case 'city': values = get_provider(Address, lng).extract(['city'])
+        case 'street': values = get_provider(Address, lng).extract(['street', 'name'])
+        case 'occupation': values = get_provider(Person, lng).extract(['occupation'])
+        case 'university': values = get_provider(Person, lng).extract(['university'])
+        case 'color': values = get_provider(Text, lng).extract(['color'])
+        case 'airplane': values = AIRPLANES
+        case 'car': values = CARS
+        case 'manufacturer': values = AUTO_MANUFACTURERS
+        case _: raise ValueError(f'Нет словаря {kind}')
+    # без повторов, чтобы словарь можно было использовать как категории
+    return np.array(list(dict.fromkeys(value.strip() for value in values)), dtype=object)
+
+
+@functools.lru_cache(maxsize=None)
+def get_vocabulary_dtype(kind: str, lng: str) -> pd.CategoricalDtype:
+    """Категориальный тип со словарём в качестве категорий"""
+    return pd.CategoricalDtype(get_vocabulary_pool(kind, lng))
+
+
+def sample_vocabulary(kind: str, lng: str, num: int, rng: np.random.Generator) -> np.ndarray:
+    """Выбираем num случайных значений словаря одним запросом индексов"""
+    pool = get_vocabulary_pool(kind, lng)
+    return pool.take(rng.integers(len(pool), size=num))
+
+
+def sample_vocabulary_codes(kind: str, lng: str, num: int, rng: np.random.Generator) -> pd.Categorical:
+    """Выбираем num случайных значений словаря в виде кодов категорий, без строк на каждый элемент"""
+    dtype = get_vocabulary_dtype(kind, lng)
+    return pd.Categorical.from_codes(rng.integers(len(dtype.categories), size=num), dtype=dtype)
+
+
+def sample_vocabulary_by_gender(kind: str, lng: str, gender_column: list, rng: np.random.Generator) -> np.ndarray:
+    """Выбираем значения словаря, зависящего от пола"""
+    female = np.asarray(gender_column) == 'F'
+    data_column = np.empty(len(female), dtype=object)
+    data_column[female] = sample_vocabulary(kind + '_female', lng, int(female.sum()), rng)
+    data_column[~female] = sample_vocabulary(kind + '_male', lng, int((~female).sum()), rng)
     return data_column
 
 
-def get_date_column(attribute: str, num: int) -> list:
-    """Получаем даты согласно значению аттрибута"""
-    start_date_str, end_date_str = attribute.split('_')[1], attribute.split('_')[2]
+def get_digit_chars(num: int, width: int, rng: np.random.Generator, low: int = 0) -> np.ndarray:
+    """Матрица num x width случайных цифр от low до 9 в виде ascii-кодов"""
+    return rng.integers(ord('0') + low, ord('9'), size=(num, width), dtype=np.uint8, endpoint=True)
 
-    start_date = datetime.strptime(start_date_str, '%d.%m.%Y')
-    end_date = datetime.strptime(end_date_str, '%d.%m.%Y')
 
-    if start_date > end_date:
-        raise ValueError("Начальная дата больше конечной даты.")
+def get_number_digits(values: np.ndarray, width: int) -> np.ndarray:
+    """Цифры чисел с ведущими нулями, матрица num x width"""
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return (np.asarray(values, dtype=np.int64)[:, None] // powers % 10).astype(np.uint8)
 
-    data_column = []
-    for _ in range(num):
-        random_days = random.randint(0, (end_date - start_date).days)
-        random_date = start_date + timedelta(days=random_days)
-        data_column.append(random_date.strftime('%d.%m.%Y'))
-
-    return data_column
 
+def get_number_chars(values: np.ndarray, width: int) -> np.ndarray:
+    """Числа с ведущими нулями в виде матрицы ascii-кодов num x width"""
+    return get_number_digits(values, width) + np.uint8(ord('0'))
 
-def get_phone_column(attribute: str, num: int) -> list:
-    """Получаем телефоны согласно значению аттрибута"""
-    person = Person(locale=Locale.EN)
 
-    data_column = []
-    country_code = '7'
-    region_code = '987'
-    if len(attribute.split('_')) == 1:
-        pass
+def get_arrow_strings(data: np.ndarray, offsets: np.ndarray) -> pd.arrays.ArrowExtensionArray:
+    """Строковый столбец arrow из одного буфера байтов utf-8 и массива смещений строк"""
+    if offsets[-1] < 2 ** 31:
+        array = pa.StringArray.from_buffers(len(offsets) - 1, pa.py_buffer(offsets.astype(np.int32)),
+                                            pa.py_buffer(data))
     else:
-        country_code = attribute.split('_')[1]
-        region_code = attribute.split('_')[2]
-
-    for _ in range(num):
-        if len(attribute.split('_')) != 1:
-            if attribute.split('_')[1] == 'r': country_code = random.choice('123456789')
-            if attribute.split('_')[2] == 'r': region_code = ''.join(random.choices('123456789', k=3))
+        array = pa.LargeStringArray.from_buffers(len(offsets) - 1, pa.py_buffer(offsets.astype(np.int64)),
+                                                 pa.py_buffer(data))
+    return pd.arrays.ArrowExtensionArray(array)
+
+
+def get_fixed_width_strings(segments: list, num: int) -> pd.arrays.ArrowExtensionArray:
+    """Собираем строки одинаковой длины из сегментов: матриц символов num x w или постоянных байтов"""
+    width = sum(segment.shape[1] if isinstance(segment, np.ndarray) else len(segment) for segment in segments)
+    chars = np.empty((num, width), dtype=np.uint8)
+    position = 0
+    for segment in segments:
+        if isinstance(segment, np.ndarray):
+            segment_width = segment.shape[1]
+            chars[:, position:position + segment_width] = segment
         else:
-            country_code = random.choice('123456789')
-            region_code = ''.join(random.choices('123456789', k=3))
+            segment_width = len(segment)
+            chars[:, position:position + segment_width] = np.frombuffer(segment, dtype=np.uint8)
+        position += segment_width
+    return get_arrow_strings(chars.reshape(-1), np.arange(num + 1, dtype=np.int64) * width)
 
-        data_column.append(person.phone_number(mask=f"{country_code}-({region_code})-###-####"))
 
-    return data_column
+def get_digit_strings(digits: np.ndarray) -> pd.arrays.ArrowExtensionArray:
+    """Строки из матрицы цифр num x width"""
+    return get_fixed_width_strings([digits + np.uint8(ord('0'))], len(digits))
 
 
-def get_int_column(attribute: str, num: int) -> list:
-    """Получаем целые числа согласно значению аттрибута"""
-    if '_' in attribute:
-        n1, n2 = int(attribute.split('_')[1]), int(attribute.split('_')[2])
-    else:
-        n1, n2 = 0, 100
-    data_column = [random.randint(n1, n2) for _ in range(num)]
+def join_columns(parts: list, separator: str, num: int) -> np.ndarray:
+    """Поэлементно соединяем столбцы строк через разделитель"""
+    if not parts:
+        return np.full(num, '', dtype=object)
+    data_column = parts[0]
+    for part in parts[1:]:
+        data_column = data_column + separator + part
     return data_column
 
 
-def get_float_column(attribute: str, num: int) -> list:
-    """Получаем нецелые числа согласно значению аттрибута"""
-    if '_' in attribute:
-        n1, n2 = float(attribute.split('_')[1]), float(attribute.split('_')[2])
-    else:
-        n1, n2 = 0.0, 1.0
-    data_column = [random.uniform(n1, n2) for _ in range(num)]
-    return data_column
+def get_names_column(spec: ColumnSpec, gender_column: list, lng: str, rng: np.random.Generator) -> np.ndarray:
+    """Получаем список имён согласно значению аттрибута"""
+    num = len(gender_column)
 
-def get_boolean_column(attribute: str, num: int) -> list:
-    """Получаем логику True/False согласно значению аттрибута"""
-    if '_' not in attribute:
-        return [random.choice([True, False]) for _ in range(num)]
+    # полное имя
+    if spec.variant == 'full':
+        name_parts = ('first', 'patronymic', 'last') if lng == 'ru' else ('first', 'last')
     else:
-        _, pr = attribute.split('_')
-        pr = int(pr)
-        if 0 <= pr <= 100:
-            return [random.random() < (pr / 100) for _ in range(num)]
-        else:
-            raise ValueError("Вероятность должна быть в диапазоне от 0 до 100")
+        name_parts = spec.parts
+
+    parts = []
+    for name_part in name_parts:
+        match name_part:
+            case 'first':
+                parts.append(sample_vocabulary_by_gender('first_name', lng, gender_column, rng))
+            case 'last':
+                parts.append(sample_vocabulary_by_gender('last_name', lng, gender_column, rng))
+            case 'patronymic':
+                # отчество есть только в русском, в других языках это второе мужское имя
+                if lng == 'ru':
+                    parts.append(sample_vocabulary_by_gender('patronymic', lng, gender_column, rng))
+                else:
+                    parts.append(sample_vocabulary('first_name_male', lng, num, rng))
 
+    return join_columns(parts, ' ', num)
 
-def get_string_column(attribute: str, num: int) -> list:
-    """Получаем строки согласно значению аттрибута"""
-    if '_' in attribute:
-        n1, n2 = int(attribute.split('_')[1]), int(attribute.split('_')[2])
-    else:
-        n1, n2 = 10, 20
 
-    if n1 < 1 or n2 < n1:
-        raise ValueError("n1 должен быть больше или равен 1, а n2 должен быть больше n1")
+def get_address_columns(spec: ColumnSpec, num: int, lng: str, rng: np.random.Generator):
+    """Получаем адреса мест согласно значению аттрибута"""
+    # только континент, страна, город или улица - категориальный столбец
+    if is_categorical_spec(spec):
+        return sample_vocabulary_codes(spec.parts[0], lng, num, rng)
 
-    data_column = []
-    for _ in range(num):
-        length = random.randint(n1, n2)  # Случайная длина строки от n1 до n2
-        random_string = ''.join(random.choices(string.ascii_letters + string.digits, k=length))
-        data_column.append(random_string)
+    parts = []
+    for place_part in spec.parts:
+        match place_part:
+            case ('num', n1, n2):
+                numbers = rng.integers(n1, n2, size=num, endpoint=True)
+                parts.append(numbers.astype(str).astype(object))
+            case _:
+                parts.append(sample_vocabulary(place_part, lng, num, rng))
+
+    return join_columns(parts, ', ', num)
 
-    return data_column
 
+def get_email_column(spec: ColumnSpec, num: int, lng: str, rng: np.random.Generator,
+                     index: np.ndarray = None) -> list:
+    """Получаем электронные почты согласно значению атрибута.
 
-def get_car_column(attribute: str, num:int, lng:str) -> list:
-    """Возвращаем лист моделей авто, номеров авто или производителей"""
+    У уникальных почт к имени дописывается .номер (index), после последней точки имени только он,
+    поэтому почты с разными номерами не совпадают.
+    """
     data_column = []
-    locale = get_locale_from_str(lng)
-    transport = Transport()
-
-    if '_' in attribute:
-        if attribute.split('_')[1] == 'brand':
-            for _ in range(num):
-                data_column.append(transport.car())
-        elif attribute.split('_')[1] == 'number':
-            for _ in range(num):
-                data_column.append(transport.vehicle_registration_code(locale=locale))
-        elif attribute.split('_')[1] == 'manufacturer':
-            for _ in range(num):
-                data_column.append(transport.manufacturer())
+    person = get_provider(Person, lng, rng)
+
+    for _ in range(num):
+        if spec.variant is not None:
+            data_column.append(person.email(domains=[spec.variant]))
         else:
-            for _ in range(num):
-                data_column.append(transport.car())
-    else:
-        for _ in range(num):
-            data_column.append(transport.car())
+            data_column.append(person.email())
+
+    if index is not None:
+        data_column = [email.replace('@', f'.{i}@', 1) for email, i in zip(data_column, index.tolist())]
 
     return data_column
 
 
-def get_airplane_column(num:int) -> list:
-    """Возвращаем лист моделей самолётов"""
-    data_column = []
-    transport = Transport()
+def get_date_column(spec: ColumnSpec, num: int, rng: np.random.Generator) -> list:
+    """Получаем даты согласно значению аттрибута"""
+    start_date, end_date = spec.low, spec.high
 
-    for _ in range(num):
-        data_column.append(transport.airplane())
+    data_column = []
+    for random_days in rng.integers(0, (end_date - start_date).days, size=num, endpoint=True):
+        random_date = start_date + timedelta(days=int(random_days))
+        data_column.append(random_date.strftime('%d.%m.%Y'))
 
     return data_column
 
 
-def get_education_column(num: int, lng: str) -> list:
-    """Получаем электронные почты согласно значению атрибута"""
-    data_column = []
-    locale = get_locale_from_str(lng)
-    person = Person(locale=locale)
+def get_phone_column(spec: ColumnSpec, num: int, rng: np.random.Generator) -> pd.arrays.ArrowExtensionArray:
+    """Получаем телефоны согласно значению аттрибута, все цифры столбца генерируются разом"""
+    country_code, region_code = spec.parts
+    segments = [
+        get_digit_chars(num, 1, rng, low=1) if country_code is None else country_code.encode(),
+        b'-(',
+        get_digit_chars(num, 3, rng, low=1) if region_code is None else region_code.encode(),
+        b')-',
+        get_digit_chars(num, 3, rng),
+        b'-',
+        get_digit_chars(num, 4, rng),
+    ]
+    return get_fixed_width_strings(segments, num)
 
-    for _ in range(num):
-        data_column.append(person.university())
 
-    return data_column
+def get_int_column(spec: ColumnSpec, num: int, rng: np.random.Generator, index: np.ndarray = None) -> np.ndarray:
+    """Получаем целые числа согласно значению аттрибута"""
+    if index is None:
+        return rng.integers(spec.low, spec.high, size=num, endpoint=True)
+    # low + index по модулю 2^64, чтобы не переполниться на границах int64
+    return (index.astype(np.uint64) + np.uint64(spec.low % 2 ** 64)).view(np.int64)
 
 
-def get_occupation_column(num: int, lng: str) -> list:
-    """Получаем электронные почты согласно значению атрибута"""
-    data_column = []
-    locale = get_locale_from_str(lng)
-    person = Person(locale=locale)
+def get_float_column(spec: ColumnSpec, num: int, rng: np.random.Generator) -> np.ndarray:
+    """Получаем нецелые числа согласно значению аттрибута"""
+    return rng.uniform(spec.low, spec.high, size=num)
 
-    for _ in range(num):
-        data_column.append(person.occupation())
 
-    return data_column
+def get_boolean_column(spec: ColumnSpec, num: int, rng: np.random.Generator) -> np.ndarray:
+    """Получаем логику True/False согласно значению аттрибута"""
+    return rng.random(num) < spec.probability
+
+
+def get_string_column(spec: ColumnSpec, num: int, rng: np.random.Generator) -> pd.arrays.ArrowExtensionArray:
+    """Получаем строки согласно значению аттрибута: один буфер случайных символов и смещения строк"""
+    alphabet = np.frombuffer((string.ascii_letters + string.digits).encode(), dtype=np.uint8)
+    lengths = rng.integers(spec.low, spec.high, size=num, endpoint=True)  # Случайная длина строки от n1 до n2
+    offsets = np.zeros(num + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    data = alphabet.take(rng.integers(len(alphabet), size=offsets[-1], dtype=np.uint8))
+    return get_arrow_strings(data, offsets)
+
+
+def get_car_number_column(num: int, lng: str, rng: np.random.Generator,
+                          index: np.ndarray = None) -> pd.arrays.ArrowExtensionArray:
+    """Получаем номера авто вида А123ВС77: буква, номер 001-999, две буквы и код региона 01-99"""
+    spec = ColumnSpec('car_number', 'car', variant='number')
+    if index is None:
+        index = rng.integers(get_value_domain(spec), size=num)
+    letters = CAR_PLATE_LETTERS['ru' if lng.lower() == 'ru' else 'en'].encode()
+    size = len(CAR_PLATE_LETTERS['ru'])
+    letters = np.frombuffer(letters, dtype=np.uint8).reshape(size, -1)
+    series, region = np.divmod(index, 99)
+    series, number = np.divmod(series, 999)
+    segments = [
+        letters[series // size ** 2],
+        get_number_chars(number + 1, 3),
+        letters[series // size % size],
+        letters[series % size],
+        get_number_chars(region + 1, 2),
+    ]
+    return get_fixed_width_strings(segments, num)
+
+
+def get_car_column(spec: ColumnSpec, num:int, lng:str, rng: np.random.Generator, index: np.ndarray = None):
+    """Возвращаем модели авто, номера авто или производителей"""
+    match spec.variant:
+        case 'number':
+            return get_car_number_column(num, lng, rng, index)
+        case 'manufacturer':
+            return sample_vocabulary_codes('manufacturer', 'en', num, rng)
+        case _:
+            return sample_vocabulary_codes('car', 'en', num, rng)
+
+
+def get_airplane_column(num:int, rng: np.random.Generator) -> pd.Categorical:
+    """Возвращаем лист моделей самолётов"""
+    return sample_vocabulary_codes('airplane', 'en', num, rng)
 
 
-def get_color_column(num: int, lng: str) -> list:
-    """Получаем список цветов"""
-    data_column = []
-    locale = get_locale_from_str(lng)
-    text = Text(locale=locale)
+def get_education_column(num: int, lng: str, rng: np.random.Generator) -> pd.Categorical:
+    """Получаем электронные почты согласно значению атрибута"""
+    return sample_vocabulary_codes('university', lng, num, rng)
 
-    for _ in range(num):
-        data_column.append(text.color())
 
-    return data_column
+def get_occupation_column(num: int, lng: str, rng: np.random.Generator) -> pd.Categorical:
+    """Получаем электронные почты согласно значению атрибута"""
+    return sample_vocabulary_codes('occupation', lng, num, rng)
 
 
-def get_bic_column(num: int) -> list:
-    """Получаем список БИК"""
-    data_column = []
-    ru = RussiaSpecProvider()
+def get_color_column(num: int, lng: str, rng: np.random.Generator) -> pd.Categorical:
+    """Получаем список цветов"""
+    return sample_vocabulary_codes('color', lng, num, rng)
 
-    for _ in range(num):
-        data_column.append(ru.bic())
 
-    return data_column
+def get_bic_column(spec: ColumnSpec, num: int, rng: np.random.Generator,
+                   index: np.ndarray = None) -> pd.arrays.ArrowExtensionArray:
+    """Получаем список БИК: 04, код региона 01-10, номер подразделения 00-99 и номер банка 050-999"""
+    if index is None:
+        index = rng.integers(get_value_domain(spec), size=num)
+    segments = [
+        b'04',
+        get_number_chars(index // (100 * 950) + 1, 2),
+        get_number_chars(index // 950 % 100, 2),
+        get_number_chars(index % 950 + 50, 3),
+    ]
+    return get_fixed_width_strings(segments, num)
 
 
-def get_inn_column(num: int) -> list:
-    """Получаем список ИНН"""
-    data_column = []
-    ru = RussiaSpecProvider()
+def get_inn_digits(body: np.ndarray) -> np.ndarray:
+    """Дописываем к 10 цифрам ИНН две контрольные цифры"""
+    n2 = body @ INN_WEIGHTS_N2 % 11 % 10
+    digits = np.column_stack([body, n2])
+    n1 = digits @ INN_WEIGHTS_N1 % 11 % 10
+    return np.column_stack([digits, n1]).astype(np.uint8)
 
-    for _ in range(num):
-        data_column.append(ru.inn())
 
-    return data_column
+def get_inn_column(spec: ColumnSpec, num: int, rng: np.random.Generator,
+                   index: np.ndarray = None) -> pd.arrays.ArrowExtensionArray:
+    """Получаем список ИНН"""
+    if index is None:
+        index = rng.integers(get_value_domain(spec), size=num)
+    body = get_number_digits(index + 10 ** 9, 10)  # первая цифра не 0
+    return get_digit_strings(get_inn_digits(body))
 
 
-def get_kpp_column(num: int) -> list:
-    """Получаем список КПП"""
-    data_column = []
-    ru = RussiaSpecProvider()
+def get_kpp_column(spec: ColumnSpec, num: int, rng: np.random.Generator,
+                   index: np.ndarray = None) -> pd.arrays.ArrowExtensionArray:
+    """Получаем список КПП: код налогового органа, код региона 01-99 и номер 001-999"""
+    if index is None:
+        index = rng.integers(get_value_domain(spec), size=num)
+    segments = [
+        KPP_TAX_CODES[index // (99 * 999)],
+        get_number_chars(index // 999 % 99 + 1, 2),
+        get_number_chars(index % 999 + 1, 3),
+    ]
+    return get_fixed_width_strings(segments, num)
 
-    for _ in range(num):
-        data_column.append(ru.kpp())
 
-    return data_column
+def get_ogrn_digits(body: np.ndarray) -> np.ndarray:
+    """Дописываем к 12 цифрам ОГРН контрольную цифру: остаток числа от деления на 11, по модулю 10"""
+    check = body @ OGRN_WEIGHTS % 11 % 10
+    return np.column_stack([body, check]).astype(np.uint8)
 
 
-def get_ogrn_column(num: int) -> list:
+def get_ogrn_column(spec: ColumnSpec, num: int, rng: np.random.Generator,
+                    index: np.ndarray = None) -> pd.arrays.ArrowExtensionArray:
     """Получаем список ОГРН"""
-    data_column = []
-    ru = RussiaSpecProvider()
+    if index is None:
+        index = rng.integers(get_value_domain(spec), size=num)
+    body = get_number_digits(index + 10 ** 11, 12)  # первая цифра не 0
+    return get_digit_strings(get_ogrn_digits(body))
 
-    for _ in range(num):
-        data_column.append(ru.ogrn())
 
-    return data_column
+def get_snils_digits(body: np.ndarray) -> np.ndarray:
+    """Дописываем к 9 цифрам СНИЛС контрольное число из двух цифр"""
+    # сумма < 100 - она сама, 100 и 101 - 00, больше 101 - остаток от деления на 101 (100 -> 00)
+    control = body @ SNILS_WEIGHTS % 101 % 100
+    return np.column_stack([body, get_number_digits(control, 2)]).astype(np.uint8)
 
 
-def get_snils_column(num: int) -> list:
+def get_snils_column(spec: ColumnSpec, num: int, rng: np.random.Generator,
+                     index: np.ndarray = None) -> pd.arrays.ArrowExtensionArray:
     """Получаем список СНИЛС"""
-    data_column = []
-    ru = RussiaSpecProvider()
-
-    for _ in range(num):
-        data_column.append(ru.snils())
-
-    return data_column
+    if index is None:
+        index = rng.integers(get_value_domain(spec), size=num)
+    return get_digit_strings(get_snils_digits(get_number_digits(index, 9)))
 
 
-def get_postal_column(num: int, lng: str) -> list:
+def get_postal_column(num: int, lng: str, rng: np.random.Generator) -> list:
     """Получаем список почтовых кодов"""
     data_column = []
-    locale = get_locale_from_str(lng)
-    address = Address(locale=locale)
+    address = get_provider(Address, lng, rng)
 
     for _ in range(num):
         data_column.append(address.postal_code())
@@ -492,70 +715,288 @@ def get_postal_column(num: int, lng: str) -> list:
     return data_column
 
 
-def get_passport_column(attribute: str, num:int) -> list:
-    """Возвращаем лист моделей авто, номеров авто или производителей"""
-    data_column = []
-    ru = RussiaSpecProvider()
-
-    if '_' in attribute:
-        if attribute.split('_')[1] == 'number':
-            for _ in range(num):
-                data_column.append(ru.passport_number())
-        elif attribute.split('_')[1] == 'series':
-            for _ in range(num):
-                data_column.append(ru.passport_series())
-        else:
-            for _ in range(num):
-                data_column.append(ru.series_and_number())
-    else:
-        for _ in range(num):
-            data_column.append(ru.series_and_number())
+def get_passport_years() -> int:
+    """Кол-во годов выдачи в серии паспорта, как в mimesis: от 10 до текущего"""
+    return datetime.now().year % 100 - 9
 
-    return data_column
 
+def get_passport_column(spec: ColumnSpec, num:int, rng: np.random.Generator, index: np.ndarray = None):
+    """Возвращаем номера, серии или серии и номера паспортов.
+
+    Серия - код региона 01-99 и год выдачи, номер - от 100000 до 999999.
+    """
+    if index is None:
+        index = rng.integers(get_value_domain(spec), size=num)
+    years = get_passport_years()
+
+    match spec.variant:
+        case 'number':
+            return np.asarray(index, dtype=np.int64) + 100_000
+        case 'series':
+            series, number = index, None
+        case _:
+            series, number = np.divmod(index, 900_000)
+
+    segments = [get_number_chars(series // years + 1, 2), b' ', get_number_chars(series % years + 10, 2)]
+    if number is not None:
+        segments += [b' ', get_number_chars(number + 100_000, 6)]
+    return get_fixed_width_strings(segments, num)
 
-def remove_random_elements(data_column: list, blank_percentage: int) -> list:
-    """Убираем рандомные элементы в списке процентно"""
+
+def remove_random_elements(data_column, blank_percentage: int, rng: np.random.Generator):
+    """Убираем рандомные элементы в столбце процентно.
+
+    Пропуски задаются булевой маской: числа и логика становятся nullable-массивами pandas,
+    строки arrow получают битовую маску валидности, сами значения при этом не копируются.
+    У категориальных столбцов пропуск - код -1.
+    """
     num_to_remove = int(len(data_column) * (blank_percentage / 100))
-    indices_to_remove = np.random.choice(len(data_column), num_to_remove, replace=False)
-    modified_data_column = data_column.copy()
-    for index in indices_to_remove:
-        modified_data_column[index] = None
-    return modified_data_column
-
-
-def get_generated_data(attributes: list, num: int, lng: str, blanks: list) -> list:
-    """Генерирует данные для таблицы"""
-    data = []
-    genders = set_genders(num)
-    for attribute, blank_pr in zip(attributes, blanks):
-        parsed_attributes = attribute.split('_')
-        match parsed_attributes[0]:
-            case 'name': data_column = get_names_column(attribute, genders, lng)
-            case 'address': data_column = get_address_columns(attribute, num, lng)
-            case 'email': data_column = get_email_column(attribute, num, lng)
-            case 'date': data_column = get_date_column(attribute, num)
-            case 'phone': data_column = get_phone_column(attribute, num)
-            case 'gender': data_column = get_gender_column(attribute, genders, lng)
-            case 'int': data_column = get_int_column(attribute, num)
-            case 'float': data_column = get_float_column(attribute, num)
-            case 'boolean': data_column = get_boolean_column(attribute, num)
-            case 'string': data_column = get_string_column(attribute, num)
-            case 'car': data_column = get_car_column(attribute, num, lng)
-            case 'airplane': data_column = get_airplane_column(num)
-            case 'education': data_column = get_education_column(num, lng)
-            case 'occupation': data_column = get_occupation_column(num, lng)
-            case 'color': data_column = get_color_column(num, lng)
-            case 'bic': data_column = get_bic_column(num)
-            case 'inn': data_column = get_inn_column(num)
-            case 'kpp': data_column = get_kpp_column(num)
-            case 'ogrn': data_column = get_ogrn_column(num)
-            case 'snils': data_column = get_snils_column(num)
-            case 'postal': data_column = get_postal_column(num, lng)
-            case 'passport': data_column = get_passport_column(attribute, num)
-            case _: raise TypeError(f'Нет типа {parsed_attributes[0]} у аттрибутов')
-        data.append(remove_random_elements(data_column, blank_pr))
-    return transpose(data)
+    if num_to_remove == 0:
+        return data_column
+    mask = np.zeros(len(data_column), dtype=bool)
+    mask[rng.choice(len(data_column), num_to_remove, replace=False)] = True
+
+    if isinstance(data_column, pd.Categorical):
+        return pd.Categorical.from_codes(np.where(mask, -1, data_column.codes), dtype=data_column.dtype)
+
+    if isinstance(data_column, pd.arrays.ArrowExtensionArray):
+        array = pa.concat_arrays(data_column.__arrow_array__().chunks)
+        validity = pa.py_buffer(np.packbits(~mask, bitorder='little'))
+        array = pa.Array.from_buffers(array.type, len(array), [validity, *array.buffers()[1:]])
+        return pd.arrays.ArrowExtensionArray(array)
+
+    if isinstance(data_column, list):
+        data_column = np.array(data_column, dtype=object)
+    match data_column.dtype.kind:
+        case 'i': return pd.arrays.IntegerArray(data_column, mask)
+        case 'f': return pd.arrays.FloatingArray(data_column, mask)
+        case 'b': return pd.arrays.BooleanArray(data_column, mask)
+        case _:
+            data_column = data_column.astype(object, copy=False)
+            data_column[mask] = None
+            return data_column
+
+
+def is_categorical_spec(spec: ColumnSpec) -> bool:
+    """Столбец с небольшим кол-вом различных значений, хранится как категории (словарь arrow)"""
+    match spec.kind:
+        case 'car': return spec.variant != 'number'
+        case 'gender' | 'airplane' | 'education' | 'occupation' | 'color': return True
+        case 'address': return len(spec.parts) == 1 and isinstance(spec.parts[0], str)
+        case _: return False
+
+
+def get_max_value_bytes(spec: ColumnSpec):
+    """Наибольшая длина значения в байтах у строковых столбцов arrow, None - столбец не из буфера arrow"""
+    match spec.kind, spec.variant:
+        case 'string', _: return spec.high
+        case 'phone', _:
+            country_code, region_code = spec.parts
+            return len(country_code or '0') + len(region_code or '000') + 12
+        case 'bic' | 'kpp', _: return 9
+        case 'inn', _: return 12
+        case 'ogrn', _: return 13
+        case 'snils', _: return 11
+        case 'passport', 'series': return 5
+        case 'passport', 'full': return 12
+        case 'car', 'number': return 11  # три кириллические буквы по 2 байта и 5 цифр
+        case _: return None
+
+
+def get_string_type(spec: ColumnSpec, num: int) -> pa.DataType:
+    """Строковый тип arrow для num значений: large_string, если смещения могут превысить 2^31"""
+    if get_max_value_bytes(spec) * num < 2 ** 31:
+        return pa.string()
+    return pa.large_string()
+
+
+def get_shard_size(attributes: list, shard_size: int) -> int:
+    """Уменьшаем шард, чтобы строковые столбцы arrow каждого шарда помещались в string со смещениями int32"""
+    for spec in attributes:
+        max_bytes = get_max_value_bytes(spec)
+        if max_bytes:
+            shard_size = min(shard_size, max(1, (2 ** 31 - 1) // max_bytes))
+    return shard_size
+
+
+def get_column_dtype(spec: ColumnSpec, blank_percentage: int, num: int):
+    """Определяем тип столбца в dataframe, при пропусках - nullable тип pandas"""
+    if is_categorical_spec(spec):
+        return 'category'
+    match spec.kind:
+        case 'int': return 'int64' if blank_percentage == 0 else 'Int64'
+        case 'passport' if spec.variant == 'number': return 'int64' if blank_percentage == 0 else 'Int64'
+        case 'float': return 'float64' if blank_percentage == 0 else 'Float64'
+        case 'boolean': return 'bool' if blank_percentage == 0 else 'boolean'
+        case _ if get_max_value_bytes(spec) is not None: return pd.ArrowDtype(get_string_type(spec, num))
+        case _: return 'object'
+
+
+def get_genders_rng(seed: int, shard: int = 0) -> np.random.Generator:
+    """Генератор для столбца пола, общего для имён и пола"""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(shard,)))
+
+
+def get_unique_index(spec: ColumnSpec, start: int, num: int, seed: int, position: int,
+                     rng: np.random.Generator) -> np.ndarray:
+    """Различные номера значений для строк start..start + num - 1 таблицы.
+
+    Номер строки переводится биекцией (a * i + b) mod m, a и b зависят только от seed и столбца,
+    поэтому значения не повторяются и в разных шардах. Если домен больше m, номер растягивается на весь домен
+    со случайным сдвигом внутри шага. Строки шарда перемешиваются.
+    """
+    if spec.kind == 'email':
+        return start + rng.permutation(num)
+
+    domain = get_value_domain(spec)
+    if start + num > domain:
+        raise ValueError(f'У столбца {spec.attribute} всего {domain} различных значений, '
+                         f'а нужно {start + num} уникальных')
+    m = min(domain, UNIQUE_BLOCK_SIZE)
+    step = domain // m
+
+    spawn_key = (position, zlib.crc32(spec.attribute.encode()))  # без шарда - одинаковые во всех шардах
+    params_rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=spawn_key))
+    a = int(params_rng.integers(1, max(m, 2)))
+    while math.gcd(a, m) != 1:
+        a = int(params_rng.integers(1, m))
+    b = int(params_rng.integers(m))
+
+    # a * i mod m по частям i, произведения меньше 2^61 и помещаются в int64
+    rows = start + rng.permutation(num)
+    high, low = rows >> 20, rows & (2 ** 20 - 1)
+    index = ((a * high % m) * 2 ** 20 % m + a * low % m + b) % m
+    if step == 1:
+        return index
+    return index.astype(np.uint64) * np.uint64(step) + rng.integers(step, size=num, dtype=np.uint64)
+
+
+def get_column_rng(seed: int, shard: int, position: int, attribute: str) -> np.random.Generator:
+    """Независимый генератор столбца, выводится из seed, шарда, позиции и типа столбца"""
+    spawn_key = (shard, position, zlib.crc32(attribute.encode()))
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=spawn_key))
+
+
+def get_generated_column(spec, position: int, num: int, lng: str, blank_pr: int,
+                         seed: int, shard: int = 0, genders: list = None, start: int = 0):
+    """Генерирует один столбец таблицы по его плану (ColumnSpec или строке типа).
+
+    Столбец зависит только от seed, шарда, своей позиции и типа, поэтому его можно сгенерировать
+    отдельно от остальных столбцов, в том числе в другом потоке или процессе.
+    start - номер первой строки шарда в таблице, нужен уникальным столбцам.
+    """
+    spec = compile_column_spec(spec)
+    rng = get_column_rng(seed, shard, position, spec.attribute)
+    index = get_unique_index(spec, start, num, seed, position, rng) if spec.unique else None
+    if genders is None and spec.kind in ('name', 'gender'):
+        genders = set_genders(num, get_genders_rng(seed, shard))
+    match spec.kind:
+        case 'name': data_column = get_names_column(spec, genders, lng, rng)
+        case 'address': data_column = get_address_columns(spec, num, lng, rng)
+        case 'email': data_column = get_email_column(spec, num, lng, rng, index)
+        case 'date': data_column = get_date_column(spec, num, rng)
+        case 'phone': data_column = get_phone_column(spec, num, rng)
+        case 'gender': data_column = get_gender_column(spec, genders, lng)
+        case 'int': data_column = get_int_column(spec, num, rng, index)
+        case 'float': data_column = get_float_column(spec, num, rng)
+        case 'boolean': data_column = get_boolean_column(spec, num, rng)
+        case 'string': data_column = get_string_column(spec, num, rng)
+        case 'car': data_column = get_car_column(spec, num, lng, rng, index)
+        case 'airplane': data_column = get_airplane_column(num, rng)
+        case 'education': data_column = get_education_column(num, lng, rng)
+        case 'occupation': data_column = get_occupation_column(num, lng, rng)
+        case 'color': data_column = get_color_column(num, lng, rng)
+        case 'bic': data_column = get_bic_column(spec, num, rng, index)
+        case 'inn': data_column = get_inn_column(spec, num, rng, index)
+        case 'kpp': data_column = get_kpp_column(spec, num, rng, index)
+        case 'ogrn': data_column = get_ogrn_column(spec, num, rng, index)
+        case 'snils': data_column = get_snils_column(spec, num, rng, index)
+        case 'postal': data_column = get_postal_column(num, lng, rng)
+        case 'passport': data_column = get_passport_column(spec, num, rng, index)
+    data_column = remove_random_elements(data_column, blank_pr, rng)
+    return pd.array(data_column, dtype=get_column_dtype(spec, blank_pr, num), copy=False)
+
+
+def get_generated_data(attributes: list, num: int, lng: str, blanks: list, names: list = None,
+                       seed: int = None, shard: int = 0, start: int = 0) -> pd.DataFrame:
+    """Генерирует таблицу по столбцам, при одинаковом seed - одинаковую.
+
+    attributes - строки типов или уже разобранный план (список ColumnSpec),
+    start - номер первой строки, если это шард большой таблицы.
+    """
+    plan = [compile_column_spec(attribute) for attribute in attributes]
+    if names is None:
+        names = [spec.attribute for spec in plan]
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    data = {}
+    genders = set_genders(num, get_genders_rng(seed, shard))
+    for position, (name, spec, blank_pr) in enumerate(zip(names, plan, blanks)):
+        data[name] = get_generated_column(spec, position, num, lng, blank_pr, seed, shard, genders, start)
+    return pd.DataFrame(data, copy=False)
+
+
+def get_generated_shards(attributes: list, num: int, lng: str, blanks: list, names: list,
+                         shard_size: int, seed: int, workers: int = 1):
+    """Генерирует таблицу по частям (шардам) в пуле из workers процессов.
+
+    Столбцы шарда номер i генерируются из seed и i, поэтому результат зависит только от seed и shard_size,
+    но не от кол-ва процессов. Шарды возвращаются по порядку. Шард с длинными строками уменьшается
+    (см. get_shard_size), чтобы у строковых столбцов всех шардов был один тип.
+    """
+    plan = [compile_column_spec(attribute) for attribute in attributes]
+    check_unique_domains(plan, num)
+    shard_size = get_shard_size(plan, shard_size)
+    shards = [(plan, min(shard_size, num - start), lng, blanks, names, seed, index, start)
+              for index, start in enumerate(range(0, num, shard_size))]
+    if workers == 1:
+        for shard in shards:
+            yield get_generated_data(*shard)
+        return
+
+    # в работе не больше двух шардов на процесс, чтобы готовые шарды не копились в памяти
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = deque()
+        for shard in shards:
+            futures.append(executor.submit(get_generated_data, *shard))
+            if len(futures) >= 2 * workers:
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+
+
+def get_arrow_schema(attributes: list, names: list, shard_size: int = DEFAULT_SHARD_SIZE) -> pa.Schema:
+    """Схема arrow таблицы, одинаковая для всех её частей не больше shard_size кортежей"""
+    plan = [compile_column_spec(attribute) for attribute in attributes]
+    shard_size = get_shard_size(plan, shard_size)
+    fields = []
+    for name, spec in zip(names, plan):
+        match spec.kind:
+            case _ if is_categorical_spec(spec): arrow_type = pa.dictionary(pa.int32(), pa.string())
+            case 'int': arrow_type = pa.int64()
+            case 'passport' if spec.variant == 'number': arrow_type = pa.int64()
+            case 'float': arrow_type = pa.float64()
+            case 'boolean': arrow_type = pa.bool_()
+            case _ if get_max_value_bytes(spec) is not None: arrow_type = get_string_type(spec, shard_size)
+            case _: arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def get_generated_batches(attributes: list, num: int, lng: str, blanks: list, names: list, chunk_size: int,
+                          seed: int, workers: int = 1):
+    """Генерирует таблицу частями (record batch) не больше chunk_size кортежей"""
+    schema = get_arrow_schema(attributes, names, chunk_size)
+    for df in get_generated_shards(attributes, num, lng, blanks, names, chunk_size, seed, workers):
+        yield pa.RecordBatch.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def save_generated_batches(batches, schema: pa.Schema, file_name: str):
+    """Потоково записываем части таблицы в файл .feather (формат Arrow IPC)"""
+    options = pa.ipc.IpcWriteOptions(compression='lz4')
+    with pa.ipc.new_file(file_name, schema, options=options) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
 
 
 if __name__ == '__main__':
@@ -616,7 +1057,7 @@ if __name__ == '__main__':
                                     passport_series - серия паспорта
                                     -------------------------------
                                     car_brand - марка авто;
-                                    car_number - номер авто;
+                                    car_number - номер авто (А123ВС77);
                                     car_manufacturer - производитель авто;
                                     -------------------------------
                                     airplane - модель самолёта
@@ -635,6 +1076,10 @@ if __name__ == '__main__':
                                     string - случайная надпись длиной от 10 до 20
                                     string_n1_n2 - случайная надпись длиной от n1 до n2
                                     -------------------------------
+                                    Суффикс _unique делает значения столбца неповторяющимися,
+                                    есть у email, inn, kpp, ogrn, snils, bic, passport, car_number и int.
+                                        Пример: inn_unique, int_1_1000_unique, email_mail.ru_unique
+                                    -------------------------------
                                     '''),
         formatter_class=argparse.RawDescriptionHelpFormatter)
 
@@ -643,7 +1088,12 @@ if __name__ == '__main__':
     parser.add_argument('-l', '--language', type=str, help='Язык таблицы базы данных: en - Английский, ru - Русский;')
     parser.add_argument('-k', '--number',  type=int, help='Количество кортежей в таблице базы данных, int;')
     parser.add_argument('-b', '--blank', nargs='+', type=int, help='Процент пустых данных от 0 до 100;')
-    parser.add_argument('-s', '--save', type=str, help='Сохранить таблицу в формате .feather по указанному пути.')
+    parser.add_argument('-s', '--save', type=str, help='Сохранить таблицу в формате .feather по указанному пути;')
+    parser.add_argument('-c', '--chunk-size', type=int,
+                        help='Потоковая генерация и запись таблицы частями по указанному кол-ву кортежей;')
+    parser.add_argument('-w', '--workers', type=int,
+                        help='Кол-во процессов для генерации, таблица делится на шарды по --chunk-size кортежей;')
+    parser.add_argument('-r', '--seed', type=int, help='Seed для воспроизводимой генерации таблицы.')
     args = parser.parse_args()
 
     """Проверка аргументов"""
@@ -687,44 +1137,101 @@ if __name__ == '__main__':
     if len(attr_names) != len(attr_types):
         raise ValueError("Кол-во названий и типов аттрибутов должно совпадать")
 
+    if len(set(attr_names)) != len(attr_names):
+        raise ValueError("Названия аттрибутов должны быть уникальными")
+
 
     """Проверка процентов пустых данных"""
 
-    blank = []
     if args.blank is None:
-        for i in range(number_of_lines):
-            blank.append(0)
+        blank = [0] * len(attr_names)
     elif len(args.blank) == 1:
-        for i in range(number_of_lines):
-            blank.append(int(args.blank[0]))
+        blank = [int(args.blank[0])] * len(attr_names)
     elif len(args.blank) != len(attr_names):
         raise ValueError("""
                             Кол-во названий и кол-во разных процентов пустых данных должно совпадать или
                             кол-во процентов должно равняться 1
                             """)
     else:
-        for blank_part in blank:
-            if not 0 <= blank_part <= 100:
-                raise ValueError("Один из процентов пустых данных не попадает в значение между 0 и 100")
+        blank = args.blank
 
+    for blank_part in blank:
+        if not 0 <= blank_part <= 100:
+            raise ValueError("Один из процентов пустых данных не попадает в значение между 0 и 100")
 
-    """Создание таблицы"""
 
-    df = pd.DataFrame(get_generated_data(attr_types, number_of_lines, language, blank), columns=attr_names)
+    """Проверка размера части таблицы для потоковой генерации"""
 
-    print('Таблица:')
-    print(df)
-    print()
+    if args.chunk_size is not None:
+        if args.chunk_size <= 0:
+            raise ValueError("Размер части таблицы должен быть больше 0")
+        if args.save is None:
+            raise ValueError("Для потоковой генерации нужно указать путь сохранения таблицы")
 
 
-    """Сохранение таблицы"""
+    """Проверка кол-ва процессов"""
 
-    if args.save is not None:
-        try:
-            file_name = args.save
-            base_name, ext = os.path.splitext(file_name)
-            file_name = base_name + '.feather'
-            df.to_feather(file_name)
-            print(f'Таблица сохранена в формате .feather по адресу: {file_name}')
-        except Exception as error:
-            print(f"Произошла ошибка: {error}")
+    if args.workers is None:
+        workers = 1
+    else:
+        workers = args.workers
+
+    if workers <= 0:
+        raise ValueError("Кол-во процессов должно быть больше 0")
+
+
+
+    """Проверка seed"""
+
+    if args.seed is None:
+        seed = np.random.SeedSequence().entropy
+    else:
+        seed = args.seed
+
+    if seed < 0:
+        raise ValueError("Seed должен быть неотрицательным")
+
+    print(f'Seed: {seed}')
+
+
+    """Разбор типов аттрибутов в план генерации"""
+
+    plan = [compile_column_spec(attribute) for attribute in attr_types]
+    check_unique_domains(plan, number_of_lines)
+
+
+    """Создание и сохранение таблицы"""
+
+    if args.chunk_size is not None:
+        # потоковый режим: в памяти одновременно только несколько частей таблицы
+        base_name, ext = os.path.splitext(args.save)
+        file_name = base_name + '.feather'
+        schema = get_arrow_schema(plan, attr_names, args.chunk_size)
+        batches = get_generated_batches(plan, number_of_lines, language, blank, attr_names, args.chunk_size,
+                                        seed, workers)
+
+        first_batch = next(batches)
+        print('Таблица (первая часть):')
+        print(first_batch.to_pandas())
+        print()
+
+        save_generated_batches(itertools.chain([first_batch], batches), schema, file_name)
+        print(f'Таблица сохранена в формате .feather по адресу: {file_name}')
+    else:
+        shards = get_generated_shards(plan, number_of_lines, language, blank, attr_names,
+                                      DEFAULT_SHARD_SIZE, seed, workers)
+        df = pd.concat(shards, ignore_index=True)
+
+        print('Таблица:')
+        print(df)
+        print()
+
+        if args.save is not None:
+            try:
+                file_name = args.save
+                base_name, ext = os.path.splitext(file_name)
+                file_name = base_name + '.feather'
+                df.to_feather(file_name)
+                print(f'Таблица сохранена в формате .feather по адресу: {file_name}')
+            except Exception as error:
+                print(f"Произошла ошибка: {error}")
@@ -1,62 +1,309 @@
 import argparse
+import itertools
 import os
 import textwrap
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 
-def get_relationship_df(df1: pd.DataFrame, df2: pd.DataFrame,
-                        cols1: list, cols2: list,
-                        num: int, rel_type: str) -> pd.DataFrame:
-    """Получения таблицы связей dataframe"""
-    output_list = []
+DEFAULT_FANOUT = 'uniform_2_10'
+
+# группы не больше стольких номеров sample_distinct выбирает все вместе, большие - по одной
+FLOYD_GROUP_SIZE = 64
+
+
+def parse_fanout(fanout: str) -> tuple:
+    """Разбираем распределение кол-ва связей у записи: uniform_n1_n2, fixed_k, poisson_l или zipf_a"""
+    parsed_fanout = fanout.split('_')
+    match parsed_fanout:
+        case ['uniform', n1, n2]:
+            n1, n2 = int(n1), int(n2)
+            if n1 < 0 or n2 < max(n1, 1):
+                raise ValueError('У uniform_n1_n2 должно быть 0 <= n1 <= n2 и n2 >= 1')
+            return 'uniform', n1, n2
+        case ['fixed', k]:
+            if int(k) < 1:
+                raise ValueError('У fixed_k должно быть k >= 1')
+            return 'fixed', int(k)
+        case ['poisson', lam]:
+            if float(lam) <= 0:
+                raise ValueError('У poisson_l должно быть l > 0')
+            return 'poisson', float(lam)
+        case ['zipf', a]:
+            if float(a) <= 1:
+                raise ValueError('У zipf_a должно быть a > 1')
+            return 'zipf', float(a)
+        case _: raise ValueError(f'Неизвестное распределение связей {fanout}')
+
+
+def get_fanout_counts(num: int, fanout: str, rng: np.random.Generator) -> np.ndarray:
+    """Кол-во связей у каждой из num записей, одним вызовом генератора"""
+    match parse_fanout(fanout):
+        case 'uniform', n1, n2: return rng.integers(n1, n2, size=num, endpoint=True)
+        case 'fixed', k: return np.full(num, k)
+        case 'poisson', lam: return rng.poisson(lam, size=num)
+        case 'zipf', a: return rng.zipf(a, size=num)
+
+
+def sample_distinct(counts: np.ndarray, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Для каждой группы counts[i] различных номеров строк из range(n), группы идут подряд.
+
+    Номера выбираются алгоритмом Флойда: на j-м шаге группа тянет число из range(n - counts[i] + j + 1)
+    и, если оно уже выбрано, берёт само n - counts[i] + j. Повторных попыток нет, каждое подмножество
+    равновероятно. Небольшие группы проходят шаги все вместе, группы больше FLOYD_GROUP_SIZE
+    выбираются по одной через rng.choice. Номера внутри группы отсортированы (counts[i] <= n).
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    offsets = np.cumsum(counts) - counts
+    values = np.empty(counts.sum(), dtype=np.int64)
+
+    # группы по убыванию размера: на шаге j участвуют первые из них, у которых больше j номеров
+    order = np.argsort(-counts, kind='stable')
+    small = order[counts[order] <= FLOYD_GROUP_SIZE]
+    sizes = counts[small]
+    columns = []
+    for j in range(sizes[0] if len(sizes) else 0):
+        active = np.searchsorted(-sizes, -j)
+        high = n - sizes[:active] + j
+        draws = rng.integers(0, high, endpoint=True)
+        taken = np.zeros(active, dtype=bool)
+        for column in columns:
+            taken |= column[:active] == draws
+        columns.append(np.where(taken, high, draws))
+        values[offsets[small[:active]] + j] = columns[-1]
+
+    for group in order[counts[order] > FLOYD_GROUP_SIZE]:
+        values[offsets[group]:offsets[group] + counts[group]] = rng.choice(n, counts[group], replace=False)
+
+    # сортируем номера внутри групп одним sort ключей group * n + номер
+    keys = np.repeat(np.arange(len(counts)), counts) * n + values
+    keys.sort()
+    return keys % n
+
+
+def get_link_counts(parents: int, num: int, fanout: str, limit: int, rng: np.random.Generator) -> np.ndarray:
+    """Кол-во связей первых из parents записей, которых хватает на num кортежей (или всех записей).
+
+    У записи не больше limit связей - столько строк в таблице, с которой она связывается.
+    Кол-ва тянутся сразу для num записей и дотягиваются, только если у записей бывает 0 связей.
+    """
+    counts = np.zeros(0, dtype=np.int64)
+    while counts.sum() < num and len(counts) < parents:
+        more = get_fanout_counts(min(parents - len(counts), num), fanout, rng)
+        counts = np.concatenate([counts, np.minimum(more, limit)])
+    return counts[:np.searchsorted(np.cumsum(counts), num) + 1]
+
+
+def fit_link_counts(counts: np.ndarray, num: int, limit: int, rng: np.random.Generator) -> np.ndarray:
+    """Подгоняем кол-ва связей записей под ровно num кортежей.
+
+    Лишние связи отрезаются с конца. Недостающие делятся между записями пропорционально их
+    свободным строкам (не больше limit связей у записи), остаток - по одной связи случайным записям.
+    """
+    total = np.cumsum(counts)
+    if total[-1] >= num:
+        last = np.searchsorted(total, num)
+        counts = counts[:last + 1].copy()
+        counts[last] -= total[last] - num
+        return counts
+    spare = limit - counts
+    shortfall = num - total[-1]
+    extra = spare * shortfall // spare.sum()
+    extra[rng.choice(np.flatnonzero(spare > extra), shortfall - extra.sum(), replace=False)] += 1
+    return counts + extra
+
+
+def get_relationship_index(len1: int, len2: int, num: int, rel_type: str,
+                           rng: np.random.Generator, fanout: str = DEFAULT_FANOUT) -> tuple:
+    """Номера строк первой и второй таблицы для каждого кортежа таблицы связей.
+
+    fanout - распределение кол-ва связей у записи (см. parse_fanout). Кортежей num,
+    если у записей хватает связей, иначе столько, сколько связей у всех записей.
+    У many_many ровно num различных пар строк, связи записей первой таблицы подгоняются под num.
+    """
     match rel_type:
         case 'one_one':
-            for i in range(min(len(df1), len(df2), num)):
-                row = {**dict(zip(cols1, df1.iloc[i])),
-                       **dict(zip(cols2, df2.iloc[i]))}
-                output_list.append(row)
+            index1 = index2 = np.arange(min(len1, len2, num))
         case 'one_many':
-            for i in range(min(len(df1), num)):
-                num_links = np.random.randint(2, 11)
-                matching_records = df2.sample(num_links)
-                for _, record in matching_records.iterrows():
-                    row = {**dict(zip(cols1, df1.iloc[i])),
-                           **dict(zip(cols2, record))}
-                    output_list.append(row)
-                if len(output_list) >= min(len(df1), num):
-                    return pd.DataFrame(output_list[:min(len(df1), num)])
+            counts = get_link_counts(len1, num, fanout, len2, rng)
+            index1 = np.repeat(np.arange(len(counts)), counts)
+            index2 = sample_distinct(counts, len2, rng)
         case 'many_one':
-            for i in range(min(len(df2), num)):
-                num_links = np.random.randint(2, 11)
-                matching_records = df1.sample(num_links)
-                for _, record in matching_records.iterrows():
-                    row = {**dict(zip(cols1, record)),
-                           **dict(zip(cols2, df2.iloc[i]))}
-                    output_list.append(row)
-                if len(output_list) >= min(len(df2), num):
-                    return pd.DataFrame(output_list[:min(len(df2), num)])
+            counts = get_link_counts(len2, num, fanout, len1, rng)
+            index1 = sample_distinct(counts, len1, rng)
+            index2 = np.repeat(np.arange(len(counts)), counts)
         case 'many_many':
-            for _ in range(num):
-                num_links = np.random.randint(2, 11)
-                record_1 = df1.sample(1).iloc[0]
-                record_2 = df2.sample(1).iloc[0]
-                matching_records_1 = df1.sample(num_links)
-                matching_records_2 = df2.sample(num_links)
-                for _, record in matching_records_2.iterrows():
-                    row = {**dict(zip(cols1, record_1)),
-                           **dict(zip(cols2, record))}
-                    output_list.append(row)
-                for _, record in matching_records_1.iterrows():
-                    row = {**dict(zip(cols1, record)),
-                           **dict(zip(cols2, record_2))}
-                    output_list.append(row)
-                if len(output_list) >= num:
-                    return pd.DataFrame(output_list[:num])
+            # пары различны: у каждой записи первой таблицы свои различные строки второй
+            if num > len1 * len2:
+                raise ValueError(f'Различных пар строк всего {len1 * len2}, а нужно {num}')
+            # на num кортежей хватает min(len1, num) записей, поэтому затраты зависят от num, а не от len1
+            counts = np.minimum(get_fanout_counts(min(len1, num), fanout, rng), len2)
+            counts = fit_link_counts(counts, num, len2, rng)
+            index1 = np.repeat(rng.choice(len1, len(counts), replace=False), counts)
+            index2 = sample_distinct(counts, len2, rng)
         case _: raise ValueError('Неизвестный тип связи')
 
-    return pd.DataFrame(output_list)
+    return index1[:num], index2[:num]
+
+
+def take_relationship_df(df1: pd.DataFrame, df2: pd.DataFrame, cols1: list, cols2: list,
+                         index1: np.ndarray, index2: np.ndarray) -> pd.DataFrame:
+    """Собираем таблицу связей по номерам строк, по одному take на каждую таблицу"""
+    df = df1[cols1].take(index1).reset_index(drop=True)
+    right = df2[cols2].take(index2).reset_index(drop=True)
+    for col in cols2:
+        df[col] = right[col]  # при совпадении названий значение из второй таблицы, как раньше
+    return df
+
+
+def get_row_numbers(index: np.ndarray, n: int) -> np.ndarray:
+    """Номера строк компактным целым типом: int32, если строк меньше 2^31"""
+    return index.astype(np.int32 if n < 2 ** 31 else np.int64, copy=False)
+
+
+def get_key_names(key1: str, key2: str) -> tuple:
+    """Названия столбцов ключей: ключевой столбец или row - номер строки, при совпадении - с суффиксами _1 и _2"""
+    name1, name2 = key1 or 'row', key2 or 'row'
+    if name1 == name2:
+        name1, name2 = name1 + '_1', name2 + '_2'
+    return name1, name2
+
+
+def take_relationship_keys(df1: pd.DataFrame, df2: pd.DataFrame, index1: np.ndarray, index2: np.ndarray,
+                           key1: str = None, key2: str = None) -> pd.DataFrame:
+    """Таблица связей только из ключей: значения столбцов key1/key2 или номера строк, если ключ не задан"""
+    name1, name2 = get_key_names(key1, key2)
+    keys1 = get_row_numbers(index1, len(df1)) if key1 is None else df1[key1].take(index1).to_numpy()
+    keys2 = get_row_numbers(index2, len(df2)) if key2 is None else df2[key2].take(index2).to_numpy()
+    return pd.DataFrame({name1: keys1, name2: keys2}, copy=False)
+
+
+def get_key_rows(df, key: str = None) -> pd.Index:
+    """Индекс значений ключа таблицы (dataframe или arrow) для поиска строк, строится один раз на таблицу"""
+    if key is None:
+        return None
+    index = pd.Index(np.asarray(df[key]))
+    if not index.is_unique:
+        raise ValueError(f'Значения ключа {key} повторяются')
+    return index
+
+
+def get_key_index(key_rows: pd.Index, keys, key: str = None) -> np.ndarray:
+    """Номера строк таблицы по значениям ключа (или сами номера строк, если ключ не задан)"""
+    if key_rows is None:
+        return np.asarray(keys)
+    rows = key_rows.get_indexer(np.asarray(keys))
+    if (rows < 0).any():
+        raise ValueError(f'В таблице нет некоторых значений ключа {key}')
+    return rows
+
+
+def get_feather_columns(file_name: str) -> list:
+    """Названия столбцов таблицы .feather без чтения данных"""
+    return pa.ipc.open_file(pa.memory_map(file_name, 'r')).schema.names
+
+
+def open_feather_table(file_name: str, columns: list) -> pa.Table:
+    """Открываем таблицу .feather (Arrow IPC) через memory map и читаем только нужные столбцы.
+
+    Несжатые столбцы не копируются в память, строки читаются из файла при обращении к ним.
+    Сжатые (lz4 или zstd, как у dbgen и pandas по умолчанию) распаковываются в память целиком.
+    """
+    source = pa.memory_map(file_name, 'r')
+    schema = pa.ipc.open_file(source).schema
+    # пустой список у included_fields - все столбцы, поэтому берём хотя бы первый, ради кол-ва строк
+    fields = [schema.get_field_index(column) for column in dict.fromkeys(columns)] or [0]
+    options = pa.ipc.IpcReadOptions(included_fields=fields)
+    return pa.ipc.open_file(source, options=options).read_all()
+
+
+def take_relationship_table(table1: pa.Table, table2: pa.Table, cols1: list, cols2: list,
+                            index1: np.ndarray, index2: np.ndarray) -> pa.Table:
+    """Часть таблицы связей в формате arrow, по одному take на каждую таблицу"""
+    left = table1.select(cols1).take(index1)
+    right = table2.select(cols2).take(index2)
+    columns = {name: left[name] for name in cols1}
+    columns.update({name: right[name] for name in cols2})  # при совпадении названий - из второй таблицы
+    return pa.table(columns)
+
+
+def take_relationship_key_table(table1: pa.Table, table2: pa.Table, index1: np.ndarray, index2: np.ndarray,
+                                key1: str = None, key2: str = None) -> pa.Table:
+    """Часть таблицы связей в формате arrow только из ключей или номеров строк"""
+    name1, name2 = get_key_names(key1, key2)
+    keys1 = get_row_numbers(index1, table1.num_rows) if key1 is None else table1[key1].take(index1)
+    keys2 = get_row_numbers(index2, table2.num_rows) if key2 is None else table2[key2].take(index2)
+    return pa.table({name1: keys1, name2: keys2})
+
+
+def get_relationship_tables(table1: pa.Table, table2: pa.Table, cols1: list, cols2: list,
+                            num: int, rel_type: str, chunk_size: int, rng: np.random.Generator = None,
+                            keys_only: bool = False, key1: str = None, key2: str = None,
+                            fanout: str = DEFAULT_FANOUT):
+    """Таблица связей частями не больше chunk_size кортежей.
+
+    В памяти только номера связанных строк и текущая часть, входные таблицы читаются в нужных строках.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    index1, index2 = get_relationship_index(table1.num_rows, table2.num_rows, num, rel_type, rng, fanout)
+    for start in range(0, len(index1), chunk_size):
+        part1, part2 = index1[start:start + chunk_size], index2[start:start + chunk_size]
+        if keys_only:
+            yield take_relationship_key_table(table1, table2, part1, part2, key1, key2)
+        else:
+            yield take_relationship_table(table1, table2, cols1, cols2, part1, part2)
+
+
+def materialize_relationship_tables(table1: pa.Table, table2: pa.Table, keys_table: pa.Table,
+                                    cols1: list, cols2: list, chunk_size: int,
+                                    key1: str = None, key2: str = None):
+    """Полная таблица связей по таблице ключей, частями не больше chunk_size кортежей"""
+    key_rows1, key_rows2 = get_key_rows(table1, key1), get_key_rows(table2, key2)
+    for start in range(0, keys_table.num_rows, chunk_size):
+        keys = keys_table.slice(start, chunk_size)
+        index1 = get_key_index(key_rows1, keys.column(0), key1)
+        index2 = get_key_index(key_rows2, keys.column(1), key2)
+        yield take_relationship_table(table1, table2, cols1, cols2, index1, index2)
+
+
+def save_relationship_tables(tables, file_name: str):
+    """Потоково записываем части таблицы связей в файл .feather (формат Arrow IPC).
+
+    Без сжатия: таблицу ключей потом открывают через memory map (-j), и сжатую пришлось бы распаковать целиком.
+    """
+    first_table = next(tables)
+    with pa.ipc.new_file(file_name, first_table.schema) as writer:
+        for table in itertools.chain([first_table], tables):
+            writer.write_table(table)
+
+
+def materialize_relationship_df(df1: pd.DataFrame, df2: pd.DataFrame, keys_df: pd.DataFrame,
+                                cols1: list, cols2: list, key1: str = None, key2: str = None) -> pd.DataFrame:
+    """Полная таблица связей по таблице ключей: первый столбец - ключи первой таблицы, второй - второй"""
+    index1 = get_key_index(get_key_rows(df1, key1), keys_df.iloc[:, 0], key1)
+    index2 = get_key_index(get_key_rows(df2, key2), keys_df.iloc[:, 1], key2)
+    return take_relationship_df(df1, df2, cols1, cols2, index1, index2)
+
+
+def get_relationship_df(df1: pd.DataFrame, df2: pd.DataFrame,
+                        cols1: list, cols2: list,
+                        num: int, rel_type: str, rng: np.random.Generator = None,
+                        keys_only: bool = False, key1: str = None, key2: str = None,
+                        fanout: str = DEFAULT_FANOUT) -> pd.DataFrame:
+    """Получения таблицы связей dataframe.
+
+    keys_only - в таблице только ключи связанных строк (столбцы key1/key2 или номера строк),
+    полную таблицу потом можно получить через materialize_relationship_df.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    index1, index2 = get_relationship_index(len(df1), len(df2), num, rel_type, rng, fanout)
+    if keys_only:
+        return take_relationship_keys(df1, df2, index1, index2, key1, key2)
+    return take_relationship_df(df1, df2, cols1, cols2, index1, index2)
 
 
 if __name__ == '__main__':
@@ -72,7 +319,24 @@ if __name__ == '__main__':
                                         one_one - один к одному
                                         one_many - один ко многим
                                         many_one - многие к одному
-                                        many_many - многие ко многим
+                                        many_many - многие ко многим, пары строк не повторяются
+                                        -------------------------------
+                                        Распределения кол-ва связей у записи (--fanout):
+                                        uniform_n1_n2 - равномерно от n1 до n2, по умолчанию uniform_2_10;
+                                        fixed_k - ровно k связей;
+                                        poisson_l - распределение Пуассона со средним l;
+                                        zipf_a - распределение Ципфа с параметром a > 1 (горячие ключи)
+                                        -------------------------------
+                                        Режимы таблицы связей:
+                                        full - выбранные аттрибуты обеих таблиц;
+                                        keys - только ключи связанных строк (-i1/-i2 или номера строк),
+                                               полную таблицу потом можно собрать по ним через -j
+                                        -------------------------------
+                                        Таблицы открываются через memory map, читаются только нужные аттрибуты.
+                                        С -c таблица связей пишется в файл частями, без загрузки таблиц в память.
+                                        Memory map работает только для несжатых файлов: сжатые аттрибуты
+                                        (lz4 - по умолчанию у dbgen и pandas) распаковываются в память целиком.
+                                        Таблицы связей сохраняются без сжатия
                                         '''),
         formatter_class=argparse.RawDescriptionHelpFormatter)
 
@@ -83,6 +347,16 @@ if __name__ == '__main__':
     parser.add_argument('-k', '--number', type=int, help='Кол-во кортежей в таблице со связями;')
     parser.add_argument('-n1', '--names_1', nargs='+', type=str, help='Названия аттрибутов для связи в первой таблице;')
     parser.add_argument('-n2', '--names_2', nargs='+', type=str, help='Названия аттрибутов для связи во второй таблице;')
+    parser.add_argument('-m', '--mode', type=str, help='Режим таблицы связей: full - аттрибуты таблиц, keys - только ключи;')
+    parser.add_argument('-i1', '--key_1', type=str,
+                        help='Ключевой аттрибут первой таблицы для режима keys, по умолчанию номер строки;')
+    parser.add_argument('-i2', '--key_2', type=str,
+                        help='Ключевой аттрибут второй таблицы для режима keys, по умолчанию номер строки;')
+    parser.add_argument('-j', '--join', type=str,
+                        help='Путь к таблице ключей .feather, по которой собирается полная таблица связей;')
+    parser.add_argument('-d', '--fanout', type=str, help='Распределение кол-ва связей у записи;')
+    parser.add_argument('-c', '--chunk-size', type=int,
+                        help='Потоковая запись таблицы связей частями по указанному кол-ву кортежей.')
     args = parser.parse_args()
 
     """Проверка аргументов"""
@@ -105,7 +379,7 @@ if __name__ == '__main__':
             print(f"Произошла ошибка: {error}")
 
     file_first = args.first
-    df_1 = pd.read_feather(file_first)
+    columns_1 = get_feather_columns(file_first)
 
     """Проверка пути ко второй таблице dataframe в формате .feather"""
 
@@ -125,7 +399,7 @@ if __name__ == '__main__':
             print(f"Произошла ошибка: {error}")
 
     file_second = args.second
-    df_2 = pd.read_feather(file_second)
+    columns_2 = get_feather_columns(file_second)
 
     """Проверка типа связи"""
 
@@ -152,35 +426,119 @@ if __name__ == '__main__':
     """Проверка названий атрибутов"""
 
     if args.names_1 is None and args.names_2 is None:
-        attr_names_1 = list(df_1)
-        attr_names_2 = list(df_2)
+        attr_names_1 = columns_1
+        attr_names_2 = columns_2
     elif args.names_1 is None:
-        attr_names_1 = list(df_1)
+        attr_names_1 = columns_1
         attr_names_2 = args.names_2
     elif args.names_2 is None:
         attr_names_1 = args.names_1
-        attr_names_2 = list(df_2)
+        attr_names_2 = columns_2
     else:
         attr_names_1 = args.names_1
         attr_names_2 = args.names_2
 
+    missing_1 = [name for name in attr_names_1 if name not in columns_1]
+    if missing_1:
+        raise ValueError(f'Аттрибутов {", ".join(missing_1)} нет в первой таблице')
+    missing_2 = [name for name in attr_names_2 if name not in columns_2]
+    if missing_2:
+        raise ValueError(f'Аттрибутов {", ".join(missing_2)} нет во второй таблице')
+
+
+    """Проверка режима таблицы связей и ключей"""
+
+    if args.mode is None:
+        mode = 'full'
+    else:
+        mode = args.mode
+        if mode not in ['full', 'keys']:
+            raise ValueError('Неизвестный режим таблицы связей')
+
+    if args.key_1 is not None and args.key_1 not in columns_1:
+        raise ValueError('Ключевого аттрибута нет в первой таблице')
+    if args.key_2 is not None and args.key_2 not in columns_2:
+        raise ValueError('Ключевого аттрибута нет во второй таблице')
+
+    if args.join is not None and not os.path.isfile(args.join):
+        raise FileNotFoundError('Таблицы ключей не существует')
+
+
+    """Проверка распределения кол-ва связей"""
+
+    if args.fanout is None:
+        fanout = DEFAULT_FANOUT
+    else:
+        fanout = args.fanout
+        parse_fanout(fanout)
+
+
+    """Проверка размера части таблицы для потоковой записи"""
+
+    if args.chunk_size is not None:
+        if args.chunk_size <= 0:
+            raise ValueError("Размер части таблицы должен быть больше 0")
+        if args.output is None:
+            raise ValueError("Для потоковой записи нужно указать путь сохранения таблицы")
+
+
+    """Открытие таблиц: только нужные аттрибуты, через memory map"""
+
+    if mode == 'keys' and args.join is None:
+        read_names_1, read_names_2 = [], []
+    else:
+        read_names_1, read_names_2 = list(attr_names_1), list(attr_names_2)
+    if args.key_1 is not None:
+        read_names_1.append(args.key_1)
+    if args.key_2 is not None:
+        read_names_2.append(args.key_2)
+    table_1 = open_feather_table(file_first, read_names_1)
+    table_2 = open_feather_table(file_second, read_names_2)
+
 
     """Получение таблицы связей"""
 
-    df = get_relationship_df(df_1, df_2, attr_names_1, attr_names_2, number_of_lines, relation_type)
+    if args.chunk_size is not None:
+        if args.join is not None:
+            keys_table = open_feather_table(args.join, get_feather_columns(args.join)[:2])
+            tables = materialize_relationship_tables(table_1, table_2, keys_table, attr_names_1, attr_names_2,
+                                                     args.chunk_size, args.key_1, args.key_2)
+        else:
+            tables = get_relationship_tables(table_1, table_2, attr_names_1, attr_names_2, number_of_lines,
+                                             relation_type, args.chunk_size, keys_only=mode == 'keys',
+                                             key1=args.key_1, key2=args.key_2, fanout=fanout)
+
+        first_table = next(tables)
+        print('Таблица (первая часть):')
+        print(first_table.to_pandas())
+        print()
 
-    print('Таблица:')
-    print(df)
-    print()
+        base_name, ext = os.path.splitext(args.output)
+        file_name = base_name + '.feather'
+        save_relationship_tables(itertools.chain([first_table], tables), file_name)
+        print(f'Таблица сохранена в формате .feather по адресу: {file_name}')
+    else:
+        df_1, df_2 = table_1.to_pandas(), table_2.to_pandas()
+        if args.join is not None:
+            keys_df = pd.read_feather(args.join)
+            df = materialize_relationship_df(df_1, df_2, keys_df, attr_names_1, attr_names_2,
+                                             args.key_1, args.key_2)
+        else:
+            df = get_relationship_df(df_1, df_2, attr_names_1, attr_names_2, number_of_lines, relation_type,
+                                     keys_only=mode == 'keys', key1=args.key_1, key2=args.key_2, fanout=fanout)
 
-    """Сохранение таблицы"""
+        print('Таблица:')
+        print(df)
+        print()
 
-    if args.output is not None:
-        try:
-            file_name = args.output
-            base_name, ext = os.path.splitext(file_name)
-            file_name = base_name + '.feather'
-            df.to_feather(file_name)
-            print(f'Таблица сохранена в формате .feather по адресу: {file_name}')
-        except Exception as error:
-            print(f"Произошла ошибка: {error}")
+        """Сохранение таблицы"""
+
+        if args.output is not None:
+            try:
+                file_name = args.output
+                base_name, ext = os.path.splitext(file_name)
+                file_name = base_name + '.feather'
+                df.to_feather(file_name, compression='uncompressed')
+                print(f'Таблица сохранена в формате .feather по адресу: {file_name}')
+            except Exception as error:
+                print(f"Произошла ошибка: {error}")
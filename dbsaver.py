@@ -1,43 +1,459 @@
 import argparse
+import importlib
+import json
+import itertools
 import os
+import queue
 import textwrap
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv
+import pyarrow.parquet
 
 
-def df_to_sql(data_frame: pd.DataFrame, file_path: str, table_name: str):
-    """Создание скрипта на языке Oracle SQL"""
-    with open(file_path, 'w', encoding="utf-8") as file:
-        sql_script = f"CREATE TABLE {table_name} (\n"
-
-        data_types = {
-            'int64': 'NUMBER',
-            'float64': 'FLOAT',
-            'object': 'VARCHAR2(255)',
-            'bool': 'VARCHAR2(5)',
-        }
-
-        for column in data_frame.columns:
-            column_type = data_types.get(str(data_frame[column].dtype), 'VARCHAR2(255)')
-            sql_script += f"    {column} {column_type},\n"
-
-        sql_script = sql_script.rstrip(',\n') + "\n);\n\n"
-        file.write(sql_script)
-
-        for index, row in data_frame.iterrows():
-            values = []
-            for value in row:
-                if pd.isnull(value):
-                    values.append('NULL')
-                elif isinstance(value, str):
-                    value = value.replace("'", "''")
-                    values.append(f"'{value}'")
-                elif isinstance(value, bool):
-                    values.append(f"'{value}'")
+# типы столбцов dataframe в типах Oracle SQL
+DATA_TYPES = {
+    'int64': 'NUMBER',
+    'Int64': 'NUMBER',
+    'float64': 'FLOAT',
+    'Float64': 'FLOAT',
+    'object': 'VARCHAR2(255)',
+    'bool': 'VARCHAR2(5)',
+    'boolean': 'VARCHAR2(5)',
+}
+
+# те же типы для остальных диалектов (PostgreSQL, MySQL, SQLite)
+ANSI_DATA_TYPES = {
+    'NUMBER': 'BIGINT',
+    'FLOAT': 'DOUBLE PRECISION',
+    'VARCHAR2(255)': 'VARCHAR(255)',
+    'VARCHAR2(5)': 'VARCHAR(5)',
+}
+
+SQL_DIALECTS = ['oracle', 'postgres', 'mysql', 'sqlite']
+
+# те же типы в управляющем файле SQL*Loader
+SQLLDR_TYPES = {
+    'NUMBER': 'INTEGER EXTERNAL',
+    'FLOAT': 'FLOAT EXTERNAL',
+    'VARCHAR2(255)': 'CHAR(255)',
+    'VARCHAR2(5)': 'CHAR(5)',
+}
+
+# кол-во кортежей в одном INSERT и в части таблицы, которая форматируется разом
+DEFAULT_BATCH_SIZE = 500
+SQL_CHUNK_SIZE = 100_000
+
+# Oracle не принимает INSERT ALL, у INTO которого в сумме больше стольких столбцов (ORA-24335)
+ORACLE_INSERT_ALL_COLUMNS = 999
+
+# кол-во кортежей в одном executemany при загрузке прямо в базу данных
+DEFAULT_DB_BATCH_SIZE = 10_000
+
+# форматы, в которые таблица переписывается частями, не загружаясь в память целиком
+STREAMING_FORMATS = ['csv', 'parquet', 'xml', 'jsonl', 'html']
+
+PARQUET_COMPRESSIONS = ['snappy', 'zstd', 'gzip', 'brotli', 'lz4', 'none']
+DEFAULT_ROW_GROUP_SIZE = 1_000_000
+
+# экранирование строк JSON: обратная косая черта и кавычка, затем управляющие символы
+JSON_ESCAPES = [('\\', '\\\\'), ('"', '\\"')]
+JSON_CONTROL_ESCAPES = [('\n', '\\n'), ('\r', '\\r'), ('\t', '\\t')] + [
+    (chr(code), f'\\u{code:04x}') for code in range(0x20) if chr(code) not in '\n\r\t']
+
+
+def get_column_type(column: pd.Series, dialect: str = 'oracle') -> str:
+    """Тип столбца в SQL по типу столбца dataframe: любые целые, нецелые и логика - по общему типу"""
+    if pd.api.types.is_bool_dtype(column.dtype):
+        column_type = DATA_TYPES['bool']
+    elif pd.api.types.is_integer_dtype(column.dtype):
+        column_type = DATA_TYPES['int64']
+    elif pd.api.types.is_float_dtype(column.dtype):
+        column_type = DATA_TYPES['float64']
+    else:
+        column_type = DATA_TYPES.get(str(column.dtype), 'VARCHAR2(255)')
+    if dialect == 'oracle':
+        return column_type
+    return ANSI_DATA_TYPES[column_type]
+
+
+def get_create_table(data_frame: pd.DataFrame, table_name: str, dialect: str = 'oracle') -> str:
+    """Скрипт CREATE TABLE по столбцам dataframe"""
+    sql_script = f"CREATE TABLE {table_name} (\n"
+    for column in data_frame.columns:
+        sql_script += f"    {column} {get_column_type(data_frame[column], dialect)},\n"
+    return sql_script.rstrip(',\n') + "\n);\n\n"
+
+
+def get_sql_value(value) -> str:
+    """Литерал SQL одного значения (для столбцов object со значениями разных типов)"""
+    if pd.isnull(value):
+        return 'NULL'
+    elif isinstance(value, str):
+        value = value.replace("'", "''")
+        return f"'{value}'"
+    elif isinstance(value, bool):
+        return f"'{value}'"
+    else:
+        return str(value)
+
+
+def is_mixed_column(column: pd.Series) -> bool:
+    """Столбец object со значениями разных типов (не только строки)"""
+    return column.dtype == object and pd.api.types.infer_dtype(column, skipna=True) not in ('string', 'empty')
+
+
+def is_quoted_column(column: pd.Series) -> bool:
+    """Значения столбца пишутся строками в кавычках, а не числами"""
+    return pd.api.types.is_bool_dtype(column.dtype) or not pd.api.types.is_numeric_dtype(column.dtype)
+
+
+def get_text_values(column: pd.Series) -> pa.Array:
+    """Значения столбца строками arrow, весь столбец разом, пропуски остаются null"""
+    nulls = column.isna().to_numpy()
+    if pd.api.types.is_bool_dtype(column.dtype):
+        texts = np.where(column.to_numpy(dtype=bool, na_value=False), 'True', 'False')
+    elif pd.api.types.is_integer_dtype(column.dtype):
+        texts = column.to_numpy(dtype=np.int64, na_value=0).astype(str)
+    elif pd.api.types.is_float_dtype(column.dtype):
+        texts = column.to_numpy(dtype=np.float64, na_value=0).astype(str)
+    elif is_mixed_column(column):
+        return pa.array([None if pd.isnull(value) else str(value) for value in column], type=pa.string())
+    else:
+        strings = pa.array(column.astype(object) if column.dtype == object else column, from_pandas=True)
+        if pa.types.is_dictionary(strings.type):
+            strings = strings.dictionary_decode()
+        return strings.cast(pa.string())
+    return pa.array(texts, type=pa.string(), mask=nulls)
+
+
+def get_quoted_values(values: pa.Array, quote: str) -> pa.Array:
+    """Строки в кавычках, кавычки внутри строки удваиваются"""
+    return pc.binary_join_element_wise(quote, pc.replace_substring(values, quote, quote * 2), quote, '')
+
+
+def get_sql_literals(column: pd.Series) -> pa.Array:
+    """Значения столбца в виде литералов SQL, весь столбец разом: строки в кавычках, пропуски - NULL"""
+    if is_mixed_column(column):
+        return pa.array([get_sql_value(value) for value in column], type=pa.string())
+    values = get_text_values(column)
+    if is_quoted_column(column):
+        values = get_quoted_values(values, "'")
+    return pc.fill_null(values, 'NULL')
+
+
+def get_sqlldr_fields(column: pd.Series) -> pa.Array:
+    """Поля файла данных SQL*Loader: строки в двойных кавычках, пропуск - пустое поле"""
+    values = get_text_values(column)
+    if is_quoted_column(column):
+        values = get_quoted_values(values, '"')
+    return pc.fill_null(values, '')
+
+
+def get_copy_fields(column: pd.Series) -> pa.Array:
+    """Поля текстового формата COPY PostgreSQL: спецсимволы экранируются, пропуск - \\N"""
+    values = get_text_values(column)
+    for char, escaped in (('\\', '\\\\'), ('\t', '\\t'), ('\n', '\\n'), ('\r', '\\r')):
+        values = pc.replace_substring(values, char, escaped)
+    return pc.fill_null(values, '\\N')
+
+
+def write_delimited_rows(data_frame: pd.DataFrame, file, get_fields, delimiter: str):
+    """Пишем кортежи строками с разделителем, столбцы форматируются разом по частям таблицы"""
+    for start in range(0, len(data_frame), SQL_CHUNK_SIZE):
+        chunk = data_frame.iloc[start:start + SQL_CHUNK_SIZE]
+        rows = pc.binary_join_element_wise(*[get_fields(chunk[column]) for column in chunk.columns], delimiter)
+        file.write('\n'.join(rows.to_pylist()) + '\n')
+
+
+def df_to_sql(data_frame: pd.DataFrame, file_path: str, table_name: str,
+              dialect: str = 'oracle', batch_size: int = DEFAULT_BATCH_SIZE):
+    """Создание скрипта на языке SQL (по умолчанию Oracle SQL).
+
+    Столбцы форматируются разом по частям таблицы, кортежи пишутся многострочными INSERT
+    по batch_size штук: INSERT ALL ... SELECT * FROM dual у Oracle, INSERT ... VALUES (...), (...) у остальных.
+    У Oracle кортежей в INSERT ALL не больше, чем помещается в ORACLE_INSERT_ALL_COLUMNS столбцов.
+    """
+    if dialect == 'oracle':
+        batch_size = min(batch_size, max(1, ORACLE_INSERT_ALL_COLUMNS // len(data_frame.columns)))
+    columns = ', '.join(data_frame.columns)
+    chunk_size = batch_size * max(1, SQL_CHUNK_SIZE // batch_size)
+    with open(file_path, 'w', encoding="utf-8", buffering=2 ** 20) as file:
+        file.write(get_create_table(data_frame, table_name, dialect))
+
+        for chunk_start in range(0, len(data_frame), chunk_size):
+            chunk = data_frame.iloc[chunk_start:chunk_start + chunk_size]
+            rows = pc.binary_join_element_wise(*[get_sql_literals(chunk[column]) for column in chunk.columns], ', ')
+            if dialect == 'oracle':
+                lines = pc.binary_join_element_wise(f"    INTO {table_name} ({columns}) VALUES (", rows, ')', '')
+            else:
+                lines = pc.binary_join_element_wise('    (', rows, ')', '')
+
+            for start in range(0, len(lines), batch_size):
+                batch = lines[start:start + batch_size].to_pylist()
+                if dialect == 'oracle':
+                    file.write('INSERT ALL\n' + '\n'.join(batch) + '\nSELECT * FROM dual;\n')
                 else:
-                    values.append(str(value))
+                    file.write(f"INSERT INTO {table_name} ({columns}) VALUES\n" + ',\n'.join(batch) + ';\n')
+
+
+def df_to_sqlldr(data_frame: pd.DataFrame, file_path: str, table_name: str):
+    """Создание управляющего файла SQL*Loader (.ctl) и файла данных (.dat) с разделителем |
 
-            insert_statement = f"INSERT INTO {table_name} ({', '.join(data_frame.columns)}) VALUES ({', '.join(values)});\n"
-            file.write(insert_statement)
+    file_path - путь без расширения. Типы полей выводятся из тех же типов Oracle SQL, что у df_to_sql.
+    """
+    data_path = file_path + '.dat'
+    fields = ',\n'.join(f"    {column} {SQLLDR_TYPES[get_column_type(data_frame[column])]}"
+                        for column in data_frame.columns)
+    with open(file_path + '.ctl', 'w', encoding="utf-8") as file:
+        file.write(f"LOAD DATA\n"
+                   f"CHARACTERSET UTF8\n"
+                   f"INFILE '{os.path.basename(data_path)}'\n"
+                   f"APPEND INTO TABLE {table_name}\n"
+                   f"FIELDS TERMINATED BY '|' OPTIONALLY ENCLOSED BY '\"'\n"
+                   f"TRAILING NULLCOLS\n"
+                   f"(\n{fields}\n)\n")
+
+    with open(data_path, 'w', encoding="utf-8", buffering=2 ** 20) as file:
+        write_delimited_rows(data_frame, file, get_sqlldr_fields, '|')
+
+
+def df_to_copy(data_frame: pd.DataFrame, file_path: str, table_name: str):
+    """Создание скрипта PostgreSQL: CREATE TABLE и данные в текстовом формате COPY ... FROM STDIN (для psql -f)"""
+    with open(file_path, 'w', encoding="utf-8", buffering=2 ** 20) as file:
+        file.write(get_create_table(data_frame, table_name, 'postgres'))
+        file.write(f"COPY {table_name} ({', '.join(data_frame.columns)}) FROM STDIN;\n")
+        write_delimited_rows(data_frame, file, get_copy_fields, '\t')
+        file.write('\\.\n')
+
+
+def get_placeholders(columns: list, paramstyle: str) -> str:
+    """Параметры запроса INSERT в стиле paramstyle модуля DB-API"""
+    match paramstyle:
+        case 'qmark': return ', '.join('?' for _ in columns)
+        case 'numeric': return ', '.join(f':{i}' for i in range(1, len(columns) + 1))
+        case 'named': return ', '.join(f':p{i}' for i in range(len(columns)))
+        case 'format' | 'pyformat': return ', '.join('%s' for _ in columns)
+        case _: raise ValueError(f'Неизвестный paramstyle {paramstyle}')
+
+
+def get_db_values(column: pd.Series) -> list:
+    """Значения столбца для executemany: числа - int/float, остальное - строки как в скрипте SQL, пропуски - None"""
+    if is_quoted_column(column) or is_mixed_column(column):
+        return get_text_values(column).to_pylist()
+    return column.astype(object).where(column.notna(), None).tolist()
+
+
+def get_db_rows(data_frame: pd.DataFrame, paramstyle: str) -> list:
+    """Кортежи части таблицы в виде параметров executemany"""
+    columns = [get_db_values(data_frame[column]) for column in data_frame.columns]
+    if paramstyle == 'named':
+        names = [f'p{i}' for i in range(len(columns))]
+        return [dict(zip(names, row)) for row in zip(*columns)]
+    return list(zip(*columns))
+
+
+def df_to_db(data_frame: pd.DataFrame, connect, table_name: str, paramstyle: str = 'qmark',
+             dialect: str = 'sqlite', batch_size: int = DEFAULT_DB_BATCH_SIZE, workers: int = 1) -> int:
+    """Загрузка таблицы прямо в базу данных через DB-API.
+
+    connect - функция, которая открывает новое соединение; открывается пул из workers соединений,
+    части таблицы по batch_size кортежей загружаются через executemany в workers потоках.
+    Таблица создаётся тем же CREATE TABLE, что у df_to_sql. Возвращает кол-во загруженных кортежей.
+    """
+    connections = queue.Queue()
+    for _ in range(workers):
+        connections.put(connect())
+
+    connection = connections.get()
+    connection.cursor().execute(get_create_table(data_frame, table_name, dialect).strip().rstrip(';'))
+    connection.commit()
+    connections.put(connection)
+
+    insert = (f"INSERT INTO {table_name} ({', '.join(data_frame.columns)}) "
+              f"VALUES ({get_placeholders(data_frame.columns, paramstyle)})")
+
+    def load_batch(rows: list) -> int:
+        connection = connections.get()
+        try:
+            connection.cursor().executemany(insert, rows)
+            connection.commit()
+        finally:
+            connections.put(connection)
+        return len(rows)
+
+    loaded, start_time, print_time = 0, time.perf_counter(), 0.0
+    try:
+        # в работе не больше двух частей на поток, чтобы параметры всей таблицы не копились в памяти
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = deque()
+            for start in range(0, len(data_frame), batch_size):
+                rows = get_db_rows(data_frame.iloc[start:start + batch_size], paramstyle)
+                futures.append(executor.submit(load_batch, rows))
+                while futures and (len(futures) >= 2 * workers or start + batch_size >= len(data_frame)):
+                    loaded += futures.popleft().result()
+                    elapsed = time.perf_counter() - start_time
+                    if elapsed - print_time >= 1 or loaded == len(data_frame):
+                        print_time = elapsed
+                        print(f'Загружено {loaded} из {len(data_frame)} кортежей, '
+                              f'{loaded / max(elapsed, 1e-9):.0f} кортежей/с')
+    finally:
+        while not connections.empty():
+            connections.get().close()
+    return loaded
+
+
+def get_db_connect(driver: str, dsn: str):
+    """Функция открытия соединения по имени модуля DB-API и строке подключения"""
+    module = importlib.import_module(driver)
+    if driver == 'sqlite3':
+        # соединения пула используются из разных потоков
+        return lambda: module.connect(dsn, check_same_thread=False, timeout=60)
+    return lambda: module.connect(dsn)
+
+
+def get_feather_batches(file_name: str):
+    """Читаем таблицу .feather (Arrow IPC) через memory map по частям (record batch)"""
+    reader = pa.ipc.open_file(pa.memory_map(file_name, 'r'))
+    for i in range(reader.num_record_batches):
+        yield reader.get_batch(i)
+
+
+def get_feather_schema(file_name: str) -> pa.Schema:
+    """Схема таблицы .feather без чтения данных"""
+    return pa.ipc.open_file(pa.memory_map(file_name, 'r')).schema
+
+
+def feather_to_csv(file_input: str, file_output: str):
+    """Потоково переписываем таблицу .feather в csv (utf-8 с BOM, как у to_csv с utf-8-sig)"""
+    with open(file_output, 'wb') as sink:
+        sink.write('\ufeff'.encode('utf-8'))
+        with pyarrow.csv.CSVWriter(sink, get_feather_schema(file_input)) as writer:
+            for batch in get_feather_batches(file_input):
+                writer.write_batch(batch)
+
+
+def feather_to_parquet(file_input: str, file_output: str, compression: str = 'snappy',
+                       row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+    """Потоково переписываем таблицу .feather в parquet.
+
+    Части копятся до row_group_size кортежей и пишутся группами ровно по row_group_size,
+    остаток переходит в следующую группу, в памяти не больше группы и одной части.
+    """
+    schema = get_feather_schema(file_input)
+    with pyarrow.parquet.ParquetWriter(file_output, schema, compression=compression) as writer:
+        batches, rows = [], 0
+        for batch in get_feather_batches(file_input):
+            batches.append(batch)
+            rows += batch.num_rows
+            if rows >= row_group_size:
+                table = pa.Table.from_batches(batches, schema)
+                full_rows = rows // row_group_size * row_group_size
+                writer.write_table(table.slice(0, full_rows), row_group_size=row_group_size)
+                batches, rows = table.slice(full_rows).to_batches(), rows - full_rows
+        if rows:
+            writer.write_table(pa.Table.from_batches(batches, schema), row_group_size=row_group_size)
+
+
+def get_batch_df(batch: pa.RecordBatch) -> pd.DataFrame:
+    """Часть таблицы в dataframe с типами arrow: целые с пропусками остаются целыми, строки не копируются"""
+    return batch.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def get_escaped_values(column: pd.Series) -> pa.Array:
+    """Значения столбца строками для XML и HTML: &, < и > экранируются"""
+    values = get_text_values(column)
+    for char, escaped in (('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;')):
+        values = pc.replace_substring(values, char, escaped)
+    return values
+
+
+def get_xml_rows(data_frame: pd.DataFrame) -> pa.Array:
+    """Элементы <row> части таблицы, как у to_xml: пропуск - пустой элемент"""
+    elements = [pc.fill_null(pc.binary_join_element_wise(f'    <{column}>', get_escaped_values(data_frame[column]),
+                                                         f'</{column}>', ''), f'    <{column}/>')
+                for column in data_frame.columns]
+    return pc.binary_join_element_wise('  <row>', *elements, '  </row>', '\n')
+
+
+def get_html_rows(data_frame: pd.DataFrame) -> pa.Array:
+    """Строки <tr> части таблицы, как у to_html: пропуск - NaN"""
+    cells = [pc.fill_null(pc.binary_join_element_wise('      <td>', get_escaped_values(data_frame[column]),
+                                                      '</td>', ''), '      <td>NaN</td>')
+             for column in data_frame.columns]
+    return pc.binary_join_element_wise('    <tr>', *cells, '    </tr>', '\n')
+
+
+def feather_to_markup(file_input: str, file_output: str, header: str, get_rows, footer: str):
+    """Потоково переписываем таблицу .feather в XML или HTML: заголовок, строки частями и окончание документа"""
+    with open(file_output, 'w', encoding='utf-8', buffering=2 ** 20) as file:
+        file.write(header)
+        for batch in get_feather_batches(file_input):
+            if batch.num_rows > 0:
+                file.write('\n'.join(get_rows(get_batch_df(batch)).to_pylist()) + '\n')
+        file.write(footer)
+
+
+def feather_to_xml(file_input: str, file_output: str):
+    """Потоково переписываем таблицу .feather в XML с разметкой to_xml: <data> и <row> на кортеж"""
+    header = '<?xml version="1.0" encoding="utf-8"?>\n<data>\n'
+    feather_to_markup(file_input, file_output, header, get_xml_rows, '</data>\n')
+
+
+def feather_to_html(file_input: str, file_output: str):
+    """Потоково переписываем таблицу .feather в таблицу HTML с разметкой to_html"""
+    names = get_feather_schema(file_input).names
+    header = ('<table border="1" class="dataframe">\n'
+              '  <thead>\n'
+              '    <tr style="text-align: right;">\n'
+              + ''.join(f'      <th>{name}</th>\n' for name in names) +
+              '    </tr>\n'
+              '  </thead>\n'
+              '  <tbody>\n')
+    feather_to_markup(file_input, file_output, header, get_html_rows, '  </tbody>\n</table>\n')
+
+
+def get_json_values(column: pd.Series) -> pa.Array:
+    """Значения столбца литералами JSON, весь столбец разом: числа - как в csv, строки в кавычках, пропуск - null"""
+    values = get_text_values(column)
+    if pd.api.types.is_bool_dtype(column.dtype):
+        values = pc.utf8_lower(values)
+    elif pd.api.types.is_float_dtype(column.dtype):
+        # у JSON нет NaN и бесконечностей, как и to_json пишем их null
+        finite = np.isfinite(column.to_numpy(dtype=np.float64, na_value=np.nan))
+        values = pc.if_else(pa.array(finite), values, pa.scalar(None, pa.string()))
+    elif not pd.api.types.is_integer_dtype(column.dtype):
+        for char, escaped in JSON_ESCAPES:
+            values = pc.replace_substring(values, char, escaped)
+        if pc.any(pc.match_substring_regex(values, '[\\x00-\\x1f]')).as_py():
+            for char, escaped in JSON_CONTROL_ESCAPES:
+                values = pc.replace_substring(values, char, escaped)
+        values = pc.binary_join_element_wise('"', values, '"', '')
+    return pc.fill_null(values, 'null')
+
+
+def get_jsonl_rows(data_frame: pd.DataFrame) -> pa.Array:
+    """Объекты JSON части таблицы, по одному на кортеж"""
+    fields = [pc.binary_join_element_wise(json.dumps(str(column), ensure_ascii=False) + ':',
+                                          get_json_values(data_frame[column]), '')
+              for column in data_frame.columns]
+    return pc.binary_join_element_wise('{', pc.binary_join_element_wise(*fields, ','), '}', '')
+
+
+def feather_to_jsonl(file_input: str, file_output: str):
+    """Потоково переписываем таблицу .feather в JSON Lines: объект на кортеж, по строке на объект.
+
+    Значения собираются в arrow, как у csv и XML, поэтому нецелые числа пишутся без округления.
+    """
+    with open(file_output, 'w', encoding='utf-8', buffering=2 ** 20) as file:
+        for batch in get_feather_batches(file_input):
+            if batch.num_rows > 0:
+                file.write('\n'.join(get_jsonl_rows(get_batch_df(batch)).to_pylist()) + '\n')
 
 
 if __name__ == '__main__':
@@ -51,17 +467,35 @@ if __name__ == '__main__':
                                         -------------------------------
                                         Поддерживаемые форматы:
                                         csv - Comma-Separated Values - значения, разделённые запятыми;
+                                        parquet - формат Apache Parquet (--compression, --row-group-size);
                                         xlsx - формат Excel;
                                         xml - eXtensible Markup Language - расширяемый язык разметки;
                                         json - JavaScript Object Notation;
+                                        jsonl - JSON Lines, объект на каждый кортеж;
                                         html - Hyper Text Markup Language
-                                        sql - скрипт sql на создание и заполнение таблицы;
+                                        sql - скрипт sql на создание и заполнение таблицы
+                                              (многострочные INSERT по --batch-size кортежей, диалект --dialect);
+                                        sqlldr - управляющий файл .ctl и файл данных .dat для SQL*Loader Oracle;
+                                        copy - скрипт PostgreSQL с данными в формате COPY ... FROM STDIN (psql -f);
+                                        db - загрузка прямо в базу данных через модуль DB-API --driver
+                                             (sqlite3, psycopg2, oracledb...) по строке подключения --dsn,
+                                             диалект CREATE TABLE - --dialect, потоков - --workers;
                                         '''),
         formatter_class=argparse.RawDescriptionHelpFormatter)
 
     parser.add_argument('-i', '--input', type=str, help='Путь к таблице dataframe в формате .feather;')
     parser.add_argument('-o', '--output', type=str, help='Путь сохранения таблицы в другом формате;')
-    parser.add_argument('-f', '--format', type=str, help='Формат сохранения.')
+    parser.add_argument('-f', '--format', type=str, help='Формат сохранения;')
+    parser.add_argument('--dialect', type=str,
+                        help='Диалект SQL для формата sql: oracle (по умолчанию), postgres, mysql или sqlite;')
+    parser.add_argument('--batch-size', type=int,
+                        help='Кол-во кортежей в одном INSERT для формата sql или в одном executemany для db;')
+    parser.add_argument('--driver', type=str, help='Модуль DB-API для формата db, по умолчанию sqlite3;')
+    parser.add_argument('--dsn', type=str, help='Строка подключения (путь к файлу у sqlite3) для формата db;')
+    parser.add_argument('-w', '--workers', type=int, help='Кол-во соединений и потоков загрузки для формата db;')
+    parser.add_argument('-p', '--compression', type=str,
+                        help='Сжатие parquet: snappy (по умолчанию), zstd, gzip, brotli, lz4 или none;')
+    parser.add_argument('-g', '--row-group-size', type=int, help='Кол-во кортежей в группе строк parquet.')
     args = parser.parse_args()
 
     """Проверка аргументов"""
@@ -87,7 +521,7 @@ if __name__ == '__main__':
 
     """Проверка для сохранения таблицы в другом формате"""
 
-    if args.output is None:
+    if args.output is None and args.format != 'db':
         raise FileNotFoundError('Не указан путь сохранения таблицы в другом формате')
 
     file_output = args.output
@@ -100,28 +534,96 @@ if __name__ == '__main__':
 
     format_type = args.format
 
-    """Чтение таблицы dataframe в формате .feather"""
 
-    df = pd.read_feather(file_input)
+    """Проверка диалекта SQL и размера INSERT"""
+
+    if args.dialect is None:
+        dialect = 'sqlite' if args.format == 'db' else 'oracle'
+    else:
+        dialect = args.dialect
+        if dialect not in SQL_DIALECTS:
+            raise ValueError('Неизвестный диалект SQL')
+
+    if args.batch_size is None:
+        batch_size = DEFAULT_DB_BATCH_SIZE if args.format == 'db' else DEFAULT_BATCH_SIZE
+    else:
+        batch_size = args.batch_size
+
+    if batch_size <= 0:
+        raise ValueError('Кол-во кортежей в INSERT должно быть больше 0')
+
 
-    print('Таблица:')
-    print(df)
+    """Проверка подключения к базе данных"""
+
+    if format_type == 'db':
+        if args.dsn is None:
+            raise ValueError('Для формата db нужно указать строку подключения --dsn')
+        driver = 'sqlite3' if args.driver is None else args.driver
+        workers = 1 if args.workers is None else args.workers
+        if workers <= 0:
+            raise ValueError('Кол-во потоков должно быть больше 0')
+
+    """Проверка сжатия и размера группы строк parquet"""
+
+    if args.compression is None:
+        compression = 'snappy'
+    else:
+        compression = args.compression
+        if compression not in PARQUET_COMPRESSIONS:
+            raise ValueError('Неизвестное сжатие parquet')
+
+    if args.row_group_size is None:
+        row_group_size = DEFAULT_ROW_GROUP_SIZE
+    else:
+        row_group_size = args.row_group_size
+
+    if row_group_size <= 0:
+        raise ValueError('Кол-во кортежей в группе строк должно быть больше 0')
+
+
+    """Чтение таблицы dataframe в формате .feather"""
+
+    if format_type in STREAMING_FORMATS:
+        # таблица переписывается частями, целиком в память не читается
+        print('Таблица (первая часть):')
+        for batch in itertools.islice(get_feather_batches(file_input), 1):
+            print(batch.to_pandas())
+    else:
+        df = pd.read_feather(file_input)
+        print('Таблица:')
+        print(df)
     print()
 
     """Переформатирование и сохранение таблицы"""
 
     base_name = os.path.basename(file_input)
     base_name = os.path.splitext(base_name)[0]
-    file_output = file_output + '\\' + base_name + '.' + format_type
+    if format_type != 'db':
+        file_output = file_output + '\\' + base_name + '.' + format_type
 
     match format_type:
-        case 'csv': df.to_csv(file_output, index=False, encoding='utf-8-sig')
+        case 'csv': feather_to_csv(file_input, file_output)
+        case 'parquet': feather_to_parquet(file_input, file_output, compression, row_group_size)
         case 'xlsx': df.to_excel(file_output, index=False)
-        case 'xml': df.to_xml(file_output, index=False)
+        case 'xml': feather_to_xml(file_input, file_output)
         case 'json': df.to_json(file_output, force_ascii=False)
-        case 'html': df.to_html(file_output, index=False)
-        case 'sql': df_to_sql(df, file_output, base_name)
+        case 'jsonl': feather_to_jsonl(file_input, file_output)
+        case 'html': feather_to_html(file_input, file_output)
+        case 'sql': df_to_sql(df, file_output, base_name, dialect, batch_size)
+        case 'sqlldr':
+            file_output = os.path.splitext(file_output)[0]
+            df_to_sqlldr(df, file_output, base_name)
+        case 'copy': df_to_copy(df, file_output, base_name)
+        case 'db':
+            paramstyle = importlib.import_module(driver).paramstyle
+            df_to_db(df, get_db_connect(driver, args.dsn), base_name, paramstyle, dialect, batch_size, workers)
         case 'none': pass
         case _: raise ValueError('Недопустимый формат')
 
-    print(f'Таблица сохранена по адресу {file_output}')
\ No newline at end of file
+    if format_type == 'db':
+        # строку подключения не печатаем: в ней бывает пароль
+        print(f'Таблица загружена в базу данных через {driver} как {base_name}')
+    elif format_type == 'sqlldr':
+        print(f'Таблица сохранена по адресам {file_output}.ctl и {file_output}.dat')
+    else:
+        print(f'Таблица сохранена по адресу {file_output}')
\ No newline at end of file
@@ -0,0 +1,270 @@
+import argparse
+import json
+import os
+import textwrap
+import zlib
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from graphlib import TopologicalSorter, CycleError
+
+import numpy as np
+import pandas as pd
+
+import dbgen
+import dbrel
+
+
+def load_schema(file_name: str) -> dict:
+    """Читаем схему базы данных из файла .json или .yaml"""
+    with open(file_name, encoding='utf-8') as file:
+        if file_name.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError('Для схемы в формате YAML нужен пакет pyyaml') from None
+            return yaml.safe_load(file)
+        return json.load(file)
+
+
+def get_table_blanks(table: dict) -> list:
+    """Проценты пустых данных столбцов таблицы схемы: одно число на все столбцы или список"""
+    blank = table.get('blank', 0)
+    if isinstance(blank, int):
+        return [blank] * len(table['columns'])
+    return list(blank)
+
+
+def check_schema(schema: dict):
+    """Проверяем схему до генерации: таблицы, типы аттрибутов, связи и их зависимости"""
+    tables = schema.get('tables', {})
+    relationships = schema.get('relationships', {})
+    if not tables:
+        raise ValueError('В схеме нет таблиц')
+    if set(tables) & set(relationships):
+        raise ValueError('Названия таблиц и связей должны быть уникальными')
+
+    for name, table in tables.items():
+        if table.get('rows', 0) <= 0:
+            raise ValueError(f'Кол-во кортежей таблицы {name} должно быть больше 0')
+        if not table.get('columns'):
+            raise ValueError(f'У таблицы {name} нет аттрибутов')
+        blanks = get_table_blanks(table)
+        if len(blanks) != len(table['columns']):
+            raise ValueError(f'У таблицы {name} кол-во аттрибутов и процентов пустых данных должно совпадать')
+        if not all(0 <= blank <= 100 for blank in blanks):
+            raise ValueError(f'У таблицы {name} процент пустых данных не попадает в значение между 0 и 100')
+        plan = [dbgen.compile_column_spec(attribute) for attribute in table['columns'].values()]
+        dbgen.check_unique_domains(plan, table['rows'])
+
+    for name, relationship in relationships.items():
+        for side in ('first', 'second'):
+            if relationship.get(side) not in tables and relationship.get(side) not in relationships:
+                raise ValueError(f'У связи {name} нет таблицы {relationship.get(side)}')
+        if relationship.get('type', 'one_one') not in ['one_one', 'one_many', 'many_one', 'many_many']:
+            raise ValueError(f'Неподдерживаемый формат связи {name}')
+        if relationship.get('rows', 10) <= 0:
+            raise ValueError(f'Кол-во кортежей связи {name} должно быть больше 0')
+        if relationship.get('mode', 'full') not in ['full', 'keys']:
+            raise ValueError(f'Неизвестный режим таблицы связи {name}')
+        dbrel.parse_fanout(relationship.get('fanout', dbrel.DEFAULT_FANOUT))
+
+
+def get_schema_graph(schema: dict) -> TopologicalSorter:
+    """Граф зависимостей схемы: таблицы ни от чего не зависят, связи - от своих двух таблиц"""
+    graph = TopologicalSorter()
+    for name in schema['tables']:
+        graph.add(name)
+    for name, relationship in schema.get('relationships', {}).items():
+        graph.add(name, relationship['first'], relationship['second'])
+    try:
+        graph.prepare()
+    except CycleError as error:
+        raise ValueError(f'Связи схемы зависят друг от друга по кругу: {error.args[1]}') from None
+    return graph
+
+
+def get_node_seed(seed: int, name: str) -> int:
+    """Seed таблицы или связи схемы, выводится из seed схемы и названия"""
+    seed_sequence = np.random.SeedSequence(seed, spawn_key=(zlib.crc32(name.encode()),))
+    return int(seed_sequence.generate_state(1, np.uint64)[0])
+
+
+def get_schema_table(table: dict, lng: str, seed: int) -> pd.DataFrame:
+    """Генерируем таблицу схемы (в процессе пула)"""
+    names = list(table['columns'])
+    plan = [dbgen.compile_column_spec(attribute) for attribute in table['columns'].values()]
+    shards = dbgen.get_generated_shards(plan, table['rows'], lng, get_table_blanks(table), names,
+                                        dbgen.DEFAULT_SHARD_SIZE, seed)
+    return pd.concat(shards, ignore_index=True)
+
+
+def get_schema_relationship(relationship: dict, df1: pd.DataFrame, df2: pd.DataFrame, seed: int) -> pd.DataFrame:
+    """Получаем таблицу связи схемы по уже готовым таблицам в памяти"""
+    return dbrel.get_relationship_df(df1, df2,
+                                     relationship.get('columns_1', list(df1)),
+                                     relationship.get('columns_2', list(df2)),
+                                     relationship.get('rows', 10),
+                                     relationship.get('type', 'one_one'),
+                                     np.random.default_rng(seed),
+                                     keys_only=relationship.get('mode', 'full') == 'keys',
+                                     key1=relationship.get('key_1'),
+                                     key2=relationship.get('key_2'),
+                                     fanout=relationship.get('fanout', dbrel.DEFAULT_FANOUT))
+
+
+def get_schema_dependents(schema: dict) -> dict:
+    """Кол-во связей схемы, которым нужна каждая таблица или связь"""
+    dependents = dict.fromkeys(list(schema['tables']) + list(schema.get('relationships', {})), 0)
+    for relationship in schema.get('relationships', {}).values():
+        for name in {relationship['first'], relationship['second']}:
+            dependents[name] += 1
+    return dependents
+
+
+def get_schema_data(schema: dict, seed: int, workers: int = 1):
+    """Генерируем все таблицы и связи схемы за один запуск, возвращаем пары (название, dataframe).
+
+    Таблицы не зависят друг от друга и генерируются параллельно в пуле из workers процессов
+    (при одном процессе - сразу в основном), связи считаются в основном процессе, как только готовы их таблицы,
+    без записи промежуточных файлов. Таблица хранится в памяти, только пока её ждут связи.
+    """
+    check_schema(schema)
+    tables = schema['tables']
+    relationships = schema.get('relationships', {})
+    lng = schema.get('language', 'en')
+    graph = get_schema_graph(schema)
+    dependents = get_schema_dependents(schema)
+    data = {}
+
+    def finish(name: str, df: pd.DataFrame):
+        """Отмечаем узел готовым и храним его, если он нужен связям"""
+        graph.done(name)
+        if dependents[name]:
+            data[name] = df
+
+    def release(relationship: dict):
+        """Забываем таблицы связи, которые больше никому не нужны"""
+        for name in {relationship['first'], relationship['second']}:
+            dependents[name] -= 1
+            if not dependents[name]:
+                del data[name]
+
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as executor:
+        futures = {}
+        while graph.is_active():
+            for name in graph.get_ready():
+                if name in relationships:
+                    relationship = relationships[name]
+                    df = get_schema_relationship(relationship, data[relationship['first']],
+                                                 data[relationship['second']], get_node_seed(seed, name))
+                    release(relationship)
+                elif executor is None:
+                    df = get_schema_table(tables[name], lng, get_node_seed(seed, name))
+                else:
+                    futures[executor.submit(get_schema_table, tables[name], lng, get_node_seed(seed, name))] = name
+                    continue
+                finish(name, df)
+                yield name, df
+            if futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures.pop(future)
+                    df = future.result()
+                    finish(name, df)
+                    yield name, df
+
+
+if __name__ == '__main__':
+    """Основное тело консольного приложения"""
+
+    """Описание и аргументы консольного приложения."""
+    parser = argparse.ArgumentParser(
+        prog='dbschema',
+        description=textwrap.dedent('''\
+                                    Генерация всей тестовой базы данных по схеме за один запуск
+                                    -------------------------------
+                                    Схема - файл .json (или .yaml, если установлен pyyaml):
+                                    {
+                                        "language": "ru",
+                                        "tables": {
+                                            "users": {"rows": 1000, "blank": 0,
+                                                      "columns": {"id": "int_1_1000000_unique",
+                                                                  "name": "name_full"}},
+                                            "cars": {"rows": 300,
+                                                     "columns": {"car_id": "int_1_1000_unique",
+                                                                 "brand": "car_brand"}}
+                                        },
+                                        "relationships": {
+                                            "user_cars": {"first": "users", "second": "cars",
+                                                          "type": "one_many", "rows": 2000,
+                                                          "mode": "keys", "key_1": "id",
+                                                          "key_2": "car_id", "fanout": "zipf_2"}
+                                        }
+                                    }
+                                    -------------------------------
+                                    Типы аттрибутов - как у dbgen, связи - как у dbrel
+                                    (first, second, type, rows, columns_1, columns_2, mode, key_1, key_2, fanout).
+                                    Связь может ссылаться и на другую связь.
+                                    Каждая таблица и связь сохраняется в папку вывода как <название>.feather
+                                    -------------------------------
+                                    '''),
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    parser.add_argument('-f', '--file', type=str, help='Путь к файлу схемы .json или .yaml;')
+    parser.add_argument('-o', '--output', type=str, help='Папка для сохранения таблиц, по умолчанию текущая;')
+    parser.add_argument('-w', '--workers', type=int, help='Кол-во процессов для генерации таблиц;')
+    parser.add_argument('-r', '--seed', type=int, help='Seed для воспроизводимой генерации базы данных.')
+    args = parser.parse_args()
+
+    """Проверка аргументов"""
+
+    """Проверка пути к файлу схемы"""
+
+    if args.file is None:
+        raise FileNotFoundError('Не указан путь к файлу схемы')
+    if not os.path.isfile(args.file):
+        raise FileNotFoundError('Файла схемы не существует')
+
+    schema = load_schema(args.file)
+
+
+    """Проверка папки для сохранения"""
+
+    if args.output is None:
+        output = '.'
+    else:
+        output = args.output
+    os.makedirs(output, exist_ok=True)
+
+
+    """Проверка кол-ва процессов"""
+
+    if args.workers is None:
+        workers = 1
+    else:
+        workers = args.workers
+
+    if workers <= 0:
+        raise ValueError("Кол-во процессов должно быть больше 0")
+
+
+    """Проверка seed"""
+
+    if args.seed is None:
+        seed = schema.get('seed', np.random.SeedSequence().entropy)
+    else:
+        seed = args.seed
+
+    if seed < 0:
+        raise ValueError("Seed должен быть неотрицательным")
+
+    print(f'Seed: {seed}')
+
+
+    """Создание и сохранение таблиц"""
+
+    for name, df in get_schema_data(schema, seed, workers):
+        file_name = os.path.join(output, name + '.feather')
+        # таблицы связей без сжатия, как у dbrel: их открывают через memory map (dbrel -j)
+        df.to_feather(file_name, compression='uncompressed' if name in schema.get('relationships', {}) else 'lz4')
+        print(f'Таблица {name} ({len(df)} кортежей) сохранена в формате .feather по адресу: {file_name}')